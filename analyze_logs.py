@@ -0,0 +1,184 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from chat_log import iter_log_records
+from chatbot_engine import FALLBACK_STAGES, ChatbotEngine, preprocess_text
+from text_cache import PreprocessCache
+
+_worker_cache = None
+
+def _init_preprocess_worker():
+    global _worker_cache
+    _worker_cache = PreprocessCache(sentence_size=0, stem_size=50000)
+
+def _preprocess_batch(messages):
+    return [preprocess_text(message, _worker_cache) for message in messages]
+
+def open_text(path, mode='r'):
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+def log_format(path, override=None):
+    if override:
+        return override
+    if os.path.isdir(path) or path.endswith('.parquet'):
+        return 'chat_log'
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.json')):
+        return 'jsonl'
+    return 'text'
+
+def iter_messages(f, fmt, field='message'):
+    if fmt == 'csv':
+        for row in csv.DictReader(f):
+            message = row.get(field)
+            if message and message.strip():
+                yield message
+        return
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        if fmt == 'jsonl':
+            try:
+                line = json.loads(line).get(field)
+            except ValueError:
+                continue
+            if not isinstance(line, str) or not line.strip():
+                continue
+        yield line
+
+def read_messages(path, fmt, field='message'):
+    if fmt == 'chat_log':
+        for record in iter_log_records(path):
+            yield record['message']
+        return
+    with open_text(path) as f:
+        yield from iter_messages(f, fmt, field)
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class ResultWriter:
+    FIELDS = ('message', 'intent', 'confidence', 'fallback')
+
+    def __init__(self, path):
+        self.fmt = 'csv' if log_format(path) == 'csv' else 'jsonl'
+        self.f = open_text(path, 'w')
+        if self.fmt == 'csv':
+            self.writer = csv.writer(self.f)
+            self.writer.writerow(self.FIELDS)
+
+    def write(self, message, intent, confidence, fallback):
+        if self.fmt == 'csv':
+            self.writer.writerow((message, intent, f"{confidence:.4f}", int(fallback)))
+        else:
+            self.f.write(json.dumps({
+                "message": message,
+                "intent": intent,
+                "confidence": round(float(confidence), 4),
+                "fallback": fallback,
+            }, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+def analyze(engine, input_path, output_path, fmt=None, field='message', chunk_size=5000, workers=1,
+            confidence_threshold=0.15):
+    intent_counts = Counter()
+    fallbacks = 0
+    total = 0
+    start = time.perf_counter()
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_preprocess_worker)
+    else:
+        _init_preprocess_worker()
+
+    writer = ResultWriter(output_path)
+    try:
+        for chunk in iter_chunks(read_messages(input_path, log_format(input_path, fmt), field), chunk_size):
+            if executor is not None:
+                batch = max(1, len(chunk) // (workers * 4))
+                processed = [
+                    text
+                    for texts in executor.map(_preprocess_batch, iter_chunks(chunk, batch))
+                    for text in texts
+                ]
+            else:
+                processed = _preprocess_batch(chunk)
+
+            for message, (intent, confidence, stage) in zip(
+                chunk, engine.classify_processed(processed, confidence_threshold)
+            ):
+                fallback = stage in FALLBACK_STAGES
+                writer.write(message, intent, confidence, fallback)
+                intent_counts[intent] += 1
+                fallbacks += fallback
+            total += len(chunk)
+
+            elapsed = time.perf_counter() - start
+            print(f"\r{total:,} baris, {total / elapsed:,.0f} baris/detik", end='', file=sys.stderr)
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown()
+    print(file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "total": total,
+        "detik": elapsed,
+        "baris_per_detik": total / elapsed if elapsed else 0.0,
+        "fallback": fallbacks,
+        "unknown": intent_counts["unknown"],
+        "intent": dict(intent_counts.most_common()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Klasifikasikan log chat secara offline untuk mencari intent yang belum terlayani")
+    parser.add_argument('input', help="berkas log JSONL/CSV/teks (boleh .gz), direktori CHATBOT_CHAT_LOG_DIR, "
+                                      "atau '-' untuk stdin")
+    parser.add_argument('output', help="berkas hasil .csv atau .jsonl (boleh .gz), '-' untuk stdout")
+    parser.add_argument('--format', choices=('jsonl', 'csv', 'text', 'chat_log'), help="format input; default dari ekstensi")
+    parser.add_argument('--field', default='message', help="nama field/kolom pesan")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--model-dir', default='models')
+    parser.add_argument('--dataset', default='datasets.json')
+    parser.add_argument('--backend', choices=('sklearn', 'numpy'), default='sklearn')
+    parser.add_argument('--top', type=int, default=10, help="jumlah intent teratas yang dicetak")
+    args = parser.parse_args()
+
+    engine = ChatbotEngine(model_dir=args.model_dir, dataset_path=args.dataset, backend=args.backend)
+    summary = analyze(engine, args.input, args.output, args.format, args.field, args.chunk_size, args.workers)
+
+    total = summary["total"] or 1
+    print(f"Selesai: {summary['total']:,} baris dalam {summary['detik']:.1f} s "
+          f"({summary['baris_per_detik']:,.0f} baris/detik)", file=sys.stderr)
+    print(f"Fallback: {summary['fallback'] / total:.1%}, unknown: {summary['unknown'] / total:.1%}", file=sys.stderr)
+    for intent, count in list(summary["intent"].items())[:args.top]:
+        print(f"  {intent:<32} {count:>10,}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+def _bucket(value, buckets):
+    for bound in buckets:
+        if value <= bound:
+            return bound
+    return "+Inf"
+
+
+class MicroBatcher:
+    def __init__(self, run_batch, max_batch_size=32, max_wait_ms=5.0):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self.batches = 0
+        self.items = 0
+        self.queued_ms_total = 0.0
+        self.queued_ms_max = 0.0
+        self.batch_size_counts = {bound: 0 for bound in BATCH_SIZE_BUCKETS + ("+Inf",)}
+        self.queued_ms_counts = {bound: 0 for bound in QUEUE_MS_BUCKETS + ("+Inf",)}
+
+        self._queue = None
+        self._dispatcher = None
+        self._running = set()
+
+    def _ensure_started(self):
+        if self._dispatcher is None:
+            self._queue = asyncio.Queue()
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def submit(self, message):
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((message, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _record(self, batch):
+        now = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_size_counts[_bucket(len(batch), BATCH_SIZE_BUCKETS)] += 1
+        for _, _, enqueued in batch:
+            queued_ms = (now - enqueued) * 1000
+            self.queued_ms_total += queued_ms
+            self.queued_ms_max = max(self.queued_ms_max, queued_ms)
+            self.queued_ms_counts[_bucket(queued_ms, QUEUE_MS_BUCKETS)] += 1
+
+    async def _dispatch_loop(self):
+        while True:
+            batch = await self._collect()
+            self._record(batch)
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        futures = [future for _, future, _ in batch]
+        try:
+            results = await self.run_batch([message for message, _, _ in batch])
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "avg_queued_ms": self.queued_ms_total / self.items if self.items else 0.0,
+            "max_queued_ms": self.queued_ms_max,
+            "batch_size_histogram": {str(k): v for k, v in self.batch_size_counts.items()},
+            "queued_ms_histogram": {str(k): v for k, v in self.queued_ms_counts.items()},
+        }
+
+    async def shutdown(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
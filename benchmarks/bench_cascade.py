@@ -0,0 +1,92 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sklearn.model_selection import train_test_split
+
+from chatbot_engine import ChatbotEngine, load_json_dataset
+from corpus import garble_text
+from metrics import EngineMetrics
+from train_model import augment_by_strategy
+
+
+def evaluation_split(data, seed):
+    """Varian augmentasi mentah dengan pembagian 80/20 yang sama seperti evaluate_model_v2."""
+    texts, labels = [], []
+    for intent in data['intents']:
+        for pattern in intent['patterns']:
+            for _, variant in augment_by_strategy(pattern):
+                texts.append(variant)
+                labels.append(intent['tag'])
+    try:
+        _, X_test, _, y_test = train_test_split(texts, labels, test_size=0.2, random_state=seed, stratify=labels)
+    except ValueError:
+        _, X_test, _, y_test = train_test_split(texts, labels, test_size=0.2, random_state=seed)
+    return X_test, y_test
+
+
+def run(engine, texts, labels):
+    engine.metrics = EngineMetrics()
+    start = time.perf_counter()
+    predictions = [engine.predict_intent(text)[0] for text in texts]
+    elapsed_us = (time.perf_counter() - start) * 1e6 / len(texts)
+    accuracy = sum(p == y for p, y in zip(predictions, labels)) / len(labels)
+    return predictions, accuracy, elapsed_us, engine.metrics.snapshot()['cascade_hit_rate']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan kaskade exact/model/fuzzy top-k dengan jalur lama")
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--top-k', type=int, nargs='+', default=[3, 10, 20])
+    parser.add_argument('--garbled', type=int, default=500,
+                        help="jumlah kueri acak tambahan untuk menguji jalur fallback")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    data = load_json_dataset(args.dataset)
+    rng = random.Random(args.seed)
+    base = [(p, intent['tag']) for intent in data['intents'] for p in intent['patterns']]
+    garbled = [(garble_text(p, rng), tag) for p, tag in (rng.choice(base) for _ in range(args.garbled))]
+    X_test, y_test = evaluation_split(data, args.seed)
+
+    suites = {
+        # Split evaluasi berisi varian dari pola latih (bocor); pola mentah memperlihatkan langsung
+        # di mana exact match menggantikan jawaban model.
+        "pola dataset": ([p for p, _ in base], [y for _, y in base]),
+        "split evaluasi": (X_test, y_test),
+        "kueri acak": ([t for t, _ in garbled], [y for _, y in garbled]),
+    }
+
+    legacy = ChatbotEngine(args.model_dir, args.dataset, exact_match=False, fallback_top_k=None)
+    configs = [("jalur lama", legacy)] + [
+        (f"kaskade top-{k}", ChatbotEngine(args.model_dir, args.dataset, fallback_top_k=k))
+        for k in args.top_k
+    ]
+
+    ambiguous = configs[1][1].ambiguous_patterns
+    print(f"{len(ambiguous)} pola terpreprocess milik lebih dari satu intent; tidak dijawab lewat exact match:")
+    for pattern in sorted(ambiguous):
+        print(f"  {pattern}")
+
+    for suite, (texts, labels) in suites.items():
+        print(f"\n{suite} ({len(texts)} pesan)")
+        print(f"  {'konfigurasi':<16} {'akurasi':>8} {'sama':>7} {'us/pesan':>9}  hit rate exact/model/fuzzy/unknown")
+        reference = None
+        for name, engine in configs:
+            predictions, accuracy, latency, hit_rate = run(engine, texts, labels)
+            if reference is None:
+                reference = predictions
+            agreement = sum(a == b for a, b in zip(predictions, reference)) / len(reference)
+            rates = '/'.join(f"{hit_rate[stage]:.2f}" for stage in ("exact", "model", "fuzzy", "unknown"))
+            print(f"  {name:<16} {accuracy:8.4f} {agreement:7.2%} {latency:9.1f}  {rates}")
+
+
+if __name__ == "__main__":
+    main()
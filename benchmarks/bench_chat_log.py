@@ -0,0 +1,90 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chat_log import FIELDS, ChatLogger, iter_log_records, log_files
+from chatbot_engine import load_json_dataset
+from corpus import mutate_text
+
+
+def make_records(dataset_path, count, seed):
+    rng = random.Random(seed)
+    sources = [(intent['tag'], p) for intent in load_json_dataset(dataset_path)['intents'] for p in intent['patterns']]
+    records = []
+    for _ in range(count):
+        tag, pattern = rng.choice(sources)
+        fallback = rng.random() < 0.1
+        records.append((mutate_text(pattern, rng), "unknown" if fallback else tag, rng.random(), fallback))
+    return records
+
+
+def sync_log_us(directory, records):
+    """Pembanding: tulis + flush satu baris gzip per permintaan, seperti logging sinkron di handler."""
+    path = os.path.join(directory, "sinkron.jsonl.gz")
+    start = time.perf_counter()
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for message, intent, confidence, fallback in records:
+            f.write(json.dumps(dict(zip(FIELDS, (time.time(), None, message, intent, confidence, fallback))),
+                               ensure_ascii=False) + "\n")
+            f.flush()
+    return (time.perf_counter() - start) * 1e6 / len(records)
+
+
+def async_log(directory, fmt, records, capacity):
+    logger = ChatLogger(directory, fmt=fmt, capacity=capacity)
+    start = time.perf_counter()
+    for message, intent, confidence, fallback in records:
+        logger.log(message, intent, confidence, fallback)
+    log_us = (time.perf_counter() - start) * 1e6 / len(records)
+    logger.close()
+    drained_s = time.perf_counter() - start
+    return logger.stats(), log_us, drained_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur biaya logging chat asinkron vs sinkron dan ukuran berkasnya")
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--burst-capacity', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    records = make_records(args.dataset, args.records, args.seed)
+    formats = ["jsonl"]
+    try:
+        import pyarrow  # noqa: F401
+        formats.append("parquet")
+    except ImportError:
+        print("pyarrow tidak terpasang; format parquet dilewati")
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"{len(records):,} catatan")
+        print(f"  sinkron (gzip write+flush per permintaan): {sync_log_us(root, records):8.2f} us/pesan")
+
+        print(f"\n{'format':<8} {'log() us':>9} {'selesai s':>10} {'byte/catatan':>13} {'baca s':>7} {'hilang':>7}")
+        for fmt in formats:
+            directory = os.path.join(root, fmt)
+            stats, log_us, drained_s = async_log(directory, fmt, records, capacity=len(records))
+            size = sum(os.path.getsize(path) for path in log_files(directory))
+            start = time.perf_counter()
+            read = sum(1 for _ in iter_log_records(directory))
+            read_s = time.perf_counter() - start
+            print(f"{fmt:<8} {log_us:9.2f} {drained_s:10.2f} {size / read:13.1f} {read_s:7.2f} "
+                  f"{stats['dropped']:7d}")
+
+        stats, _, _ = async_log(os.path.join(root, "burst"), "jsonl", records, capacity=args.burst_capacity)
+        print(f"\nLonjakan tanpa jeda dengan buffer {args.burst_capacity:,}: ditulis {stats['written']:,}, "
+              f"dibuang {stats['dropped']:,} (dihitung di counter, bukan memblokir permintaan)")
+
+
+if __name__ == "__main__":
+    main()
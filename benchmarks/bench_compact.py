@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from model_bundle import find_bundle
+
+VARIAN = {
+    "pickle (sklearn)": {"use_bundle": False},
+    "bundle (numpy)": {"backend": "numpy"},
+    "ringkas (numpy)": {"compact": True},
+}
+
+SNIPPET = """
+import json, sys, time
+import numpy as np
+from sklearn.model_selection import train_test_split
+from train_model import load_dataset
+
+def rss_kb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4
+
+X, y = load_dataset(sys.argv[2], augment=True)
+_, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+from chatbot_engine import ChatbotEngine
+before = rss_kb()
+engine = ChatbotEngine(model_dir=sys.argv[1], dataset_path=sys.argv[2], **json.loads(sys.argv[3]))
+# Diukur setelah prediksi pertama supaya halaman bobot yang di-mmap ikut terhitung
+predictions = engine.model.predict_proba(engine.vectorizer.transform(X_test)).argmax(axis=1)
+after = rss_kb()
+accuracy = float(np.mean(engine.model.classes_[predictions] == np.array(y_test)))
+
+samples = X_test[:int(sys.argv[4])]
+start = time.perf_counter()
+for text in samples:
+    engine.model.predict_proba(engine.vectorizer.transform([text]))
+latency_us = (time.perf_counter() - start) * 1e6 / len(samples)
+print(json.dumps({"rss_kb": after - before, "accuracy": accuracy, "latency_us": latency_us}))
+"""
+
+
+def directory_size(paths):
+    total = 0
+    for path in paths:
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+        for root, _, files in os.walk(path):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def measure(model_dir, dataset_path, kwargs, samples):
+    env = dict(os.environ, PYTHONWARNINGS='ignore')
+    output = subprocess.run(
+        [sys.executable, '-c', SNIPPET, model_dir, dataset_path, json.dumps(kwargs), str(samples)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan model penuh dan varian ringkas")
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--samples', type=int, default=500)
+    args = parser.parse_args()
+
+    if not find_bundle(args.model_dir, 'compact'):
+        sys.exit(f"Bundle ringkas tidak ditemukan di {args.model_dir}/compact. Jalankan: python train_model.py --compact")
+
+    files = {
+        "pickle (sklearn)": [f'{args.model_dir}/model.pkl', f'{args.model_dir}/vectorizer.pkl'],
+        "bundle (numpy)": [f'{args.model_dir}/bundle'],
+        "ringkas (numpy)": [f'{args.model_dir}/compact'],
+    }
+
+    print("Akurasi diukur pada split uji 80/20 yang sama dengan train_model.py")
+    print(f"{'varian':<18} {'disk KB':>9} {'RSS KB':>9} {'us/pesan':>9} {'akurasi':>8}")
+    baseline = None
+    for name, kwargs in VARIAN.items():
+        result = measure(args.model_dir, args.dataset, kwargs, args.samples)
+        baseline = baseline or result
+        print(f"{name:<18} {directory_size(files[name]) / 1024:9.1f} {result['rss_kb']:9d} "
+              f"{result['latency_us']:9.1f} {result['accuracy']:8.4f} "
+              f"({result['accuracy'] - baseline['accuracy']:+.4f})")
+
+
+if __name__ == "__main__":
+    main()
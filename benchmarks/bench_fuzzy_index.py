@@ -0,0 +1,98 @@
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot_engine import calculate_similarity, load_json_dataset, preprocess_text
+from fuzzy_index import PatternIndex
+
+
+def linear_best_match(processed_input, patterns, threshold=0.6):
+    best_match = None
+    best_score = 0
+    for pattern in patterns:
+        score = calculate_similarity(processed_input, pattern)
+        if score > best_score and score >= threshold:
+            best_score = score
+            best_match = pattern
+    if best_match:
+        return best_match, best_score
+
+    input_words = set(processed_input.split())
+    for pattern in patterns:
+        pattern_words = set(pattern.split())
+        if input_words and pattern_words:
+            jaccard = len(input_words & pattern_words) / len(input_words | pattern_words)
+            if jaccard > best_score and jaccard >= 0.4:
+                best_score = jaccard
+                best_match = pattern
+    return best_match, best_score
+
+
+def indexed_best_match(processed_input, index, threshold=0.6):
+    best_match, best_score = index.best_ratio_match(processed_input, threshold)
+    if best_match:
+        return best_match, best_score
+    return index.best_jaccard_match(processed_input, 0.4)
+
+
+def mutate(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(1, 3)):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.4:
+            chars.insert(pos, rng.choice(string.ascii_lowercase))
+        elif op < 0.7 and chars:
+            del chars[min(pos, len(chars) - 1)]
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice(string.ascii_lowercase)
+    return ''.join(chars).strip() or text
+
+
+def synthetic_patterns(patterns, multiple, rng):
+    result = list(patterns)
+    for _ in range(multiple - 1):
+        result.extend(mutate(p, rng) for p in patterns)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan fallback fuzzy linear dan terindeks")
+    parser.add_argument('--dataset', default='datasets.json')
+    parser.add_argument('--multiples', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = load_json_dataset(args.dataset)
+    base = [preprocess_text(p) for intent in data['intents'] for p in intent['patterns']]
+    queries = [mutate(rng.choice(base), rng) for _ in range(args.queries)]
+
+    for multiple in args.multiples:
+        patterns = synthetic_patterns(base, multiple, rng)
+        start = time.perf_counter()
+        index = PatternIndex(patterns)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        expected = [linear_best_match(q, patterns) for q in queries]
+        linear_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        start = time.perf_counter()
+        actual = [indexed_best_match(q, index) for q in queries]
+        indexed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        agree = sum(1 for e, a in zip(expected, actual) if e[0] == a[0])
+        print(f"{multiple:>4}x  pola={len(patterns):>6}  build={build_ms:8.1f} ms  "
+              f"linear={linear_ms:8.3f} ms/q  indeks={indexed_ms:7.3f} ms/q  "
+              f"sama={agree}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
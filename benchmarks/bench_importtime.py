@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_breakdown(module, env):
+    """Waktu impor per paket tingkat atas dari `python -X importtime -c 'import <module>'`.
+
+    Yang dijumlahkan adalah kolom self (tanpa waktu submodul), jadi tidak ada yang terhitung dua kali;
+    waktu self modul `main` termasuk kode yang dijalankan saat impor, mis. memuat engine.
+    """
+    start = time.perf_counter()
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    wall_s = time.perf_counter() - start
+
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(self_us) / 1e6
+    return wall_s, packages
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return json.loads(response.read())
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.02)
+    raise TimeoutError(url)
+
+
+def time_to_ready(env, timeout):
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout
+        wait_for(f'http://127.0.0.1:{port}/health', deadline)
+        health_s = time.perf_counter() - start
+        wait_for(f'http://127.0.0.1:{port}/ready', deadline)
+        ready_s = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+    return health_s, ready_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rincian waktu impor dan waktu sampai /health dan /ready")
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--top', type=int, default=12)
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    modes = {"biasa": "0", "mulai cepat": "1"}
+    breakdowns = {}
+    for name, flag in modes.items():
+        env = dict(os.environ, CHATBOT_FAST_START=flag, PYTHONWARNINGS='ignore')
+        breakdowns[name] = import_breakdown(args.module, env)
+
+    names = list(modes)
+    print(f"Waktu impor `import {args.module}` per paket tingkat atas (python -X importtime), ms:")
+    print(f"{'paket':<24}" + ''.join(f"{name:>14}" for name in names))
+    total = Counter()
+    for name in names:
+        total.update(breakdowns[name][1])
+    for package, _ in total.most_common(args.top):
+        print(f"{package:<24}" + ''.join(f"{breakdowns[name][1][package] * 1000:14.1f}" for name in names))
+    print(f"{'total proses (wall)':<24}" + ''.join(f"{breakdowns[name][0] * 1000:14.1f}" for name in names))
+
+    print("\nWaktu sejak proses uvicorn dimulai, s:")
+    print(f"{'mode':<14} {'/health':>9} {'/ready':>9}")
+    for name, flag in modes.items():
+        env = dict(os.environ, CHATBOT_FAST_START=flag, PYTHONWARNINGS='ignore')
+        health_s, ready_s = time_to_ready(env, args.timeout)
+        print(f"{name:<14} {health_s:9.2f} {ready_s:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
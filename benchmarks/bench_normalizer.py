@@ -0,0 +1,78 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot_engine import (
+    CHAR_REPLACEMENTS, SLANG_DICTIONARY, USE_STEMMER, load_json_dataset, normalize_text,
+    get_stemmer, preprocess_text,
+)
+from train_model import augment_text
+
+
+def legacy_normalize_text(text):
+    text = text.lower()
+    for char, replacement in CHAR_REPLACEMENTS.items():
+        text = text.replace(char, replacement)
+    text = re.sub(r'[^a-z0-9\s]', '', text)
+    text = re.sub(r'(.)\1{2,}', r'\1', text)
+    normalized = []
+    for word in text.split():
+        if word.lower() in SLANG_DICTIONARY:
+            replacement = SLANG_DICTIONARY[word.lower()]
+            if replacement:
+                normalized.append(replacement)
+        else:
+            normalized.append(word)
+    text = ' '.join(normalized)
+    return re.sub(r'\s+', ' ', text)
+
+
+def legacy_preprocess_text(text):
+    text = legacy_normalize_text(text)
+    if USE_STEMMER:
+        text = get_stemmer().stem(text)
+    return text.strip()
+
+
+def per_message_us(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark normalisasi teks")
+    parser.add_argument('--dataset', default='datasets.json')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    data = load_json_dataset(args.dataset)
+    patterns = [p for intent in data['intents'] for p in intent['patterns']]
+    augmented = [a for p in patterns for a in augment_text(p)]
+
+    mismatched = [p for p in patterns if legacy_preprocess_text(p) != preprocess_text(p)]
+    print(f"Pola dataset: {len(patterns)}, hasil berbeda: {len(mismatched)}")
+    multi_word = [p for p in augmented if legacy_normalize_text(p) != normalize_text(p)]
+    print(f"Variasi augmentasi: {len(augmented)}, berbeda karena slang multi-kata: {len(multi_word)}")
+    for text in multi_word[:5]:
+        print(f"  {text!r}: {legacy_normalize_text(text)!r} -> {normalize_text(text)!r}")
+
+    legacy_us = per_message_us(legacy_normalize_text, augmented, args.repeat)
+    compiled_us = per_message_us(normalize_text, augmented, args.repeat)
+    print(f"Normalisasi  lama: {legacy_us:7.2f} us/pesan  baru: {compiled_us:7.2f} us/pesan  "
+          f"({legacy_us / compiled_us:.2f}x)")
+
+    legacy_us = per_message_us(legacy_preprocess_text, augmented, 1)
+    compiled_us = per_message_us(preprocess_text, augmented, 1)
+    print(f"Preprocessing lama: {legacy_us:7.2f} us/pesan  baru: {compiled_us:7.2f} us/pesan  "
+          f"({legacy_us / compiled_us:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
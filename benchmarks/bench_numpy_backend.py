@@ -0,0 +1,74 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from chatbot_engine import ChatbotEngine, load_json_dataset
+from model_bundle import find_bundle
+
+
+def import_ms(statement, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c',
+             f"import time; s = time.perf_counter(); {statement}; print((time.perf_counter() - s) * 1000)"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def latency_us(engine, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            engine.model.predict_proba(engine.vectorizer.transform([text]))
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan backend sklearn dan numpy")
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--import-runs', type=int, default=3)
+    args = parser.parse_args()
+
+    if not find_bundle(args.model_dir):
+        sys.exit(f"Bundle tidak ditemukan di {args.model_dir}/bundle. Jalankan: python model_bundle.py")
+
+    sklearn_engine = ChatbotEngine(args.model_dir, args.dataset, backend='sklearn')
+    numpy_engine = ChatbotEngine(args.model_dir, args.dataset, backend='numpy')
+
+    data = load_json_dataset(args.dataset)
+    texts = [sklearn_engine.preprocess_text(p) for intent in data['intents'] for p in intent['patterns']]
+
+    expected = sklearn_engine.model.predict_proba(sklearn_engine.vectorizer.transform(texts))
+    actual = numpy_engine.model.predict_proba(numpy_engine.vectorizer.transform(texts))
+    max_diff = float(np.abs(expected - actual).max())
+    print(f"Selisih probabilitas maksimum ({len(texts)} pola): {max_diff:.3e}"
+          f" -> {'OK' if max_diff <= 1e-6 else 'GAGAL'}")
+
+    sklearn_us = latency_us(sklearn_engine, texts, args.repeat)
+    numpy_us = latency_us(numpy_engine, texts, args.repeat)
+    print(f"Latensi 1 pesan  sklearn: {sklearn_us:8.1f} us  numpy: {numpy_us:8.1f} us"
+          f"  ({sklearn_us / numpy_us:.1f}x)")
+
+    sklearn_import = import_ms("import sklearn.feature_extraction.text, sklearn.linear_model", args.import_runs)
+    numpy_import = import_ms("import numpy_backend", args.import_runs)
+    print(f"Waktu import     sklearn: {sklearn_import:8.1f} ms  numpy: {numpy_import:8.1f} ms")
+
+    if max_diff > 1e-6:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# main.py diimpor hanya untuk model dan encoder-nya; engine utamanya tidak perlu dimuat
+os.environ["CHATBOT_FAST_START"] = "1"
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from chatbot_engine import ChatbotEngine, load_json_dataset
+from main import PermintaanChat, ResponChat, encode_respon_chat
+
+
+def build_app(results):
+    app = FastAPI()
+
+    @app.post("/lama", response_model=ResponChat)
+    async def lama(request: PermintaanChat):
+        result = results[request.message]
+        return ResponChat(
+            pesan_pengguna=request.message,
+            respon_bot=result["response"],
+            intent=result["intent"],
+            kepercayaan=result["confidence"]
+        )
+
+    @app.post("/baru", response_model=ResponChat)
+    async def baru(request: PermintaanChat):
+        return Response(content=encode_respon_chat(request.message, results[request.message]),
+                        media_type="application/json")
+
+    return app
+
+
+async def call(app, path, body):
+    """Panggil aplikasi ASGI langsung, tanpa socket/klien HTTP, supaya yang terukur hanya sisi server."""
+    chunks = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def per_request_us(app, path, bodies):
+    start = time.perf_counter()
+    for body in bodies:
+        await call(app, path, body)
+    return (time.perf_counter() - start) * 1e6 / len(bodies)
+
+
+def per_call_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) * 1e6 / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan serialisasi ResponChat pydantic dengan payload ter-encode")
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    messages = [p for intent in load_json_dataset(args.dataset)['intents'] for p in intent['patterns']]
+    messages = list(dict.fromkeys(messages))
+    engine = ChatbotEngine(model_dir=args.model_dir, dataset_path=args.dataset, seed=args.seed)
+    results = dict(zip(messages, engine.get_responses(messages)))
+
+    replay = ChatbotEngine(model_dir=args.model_dir, dataset_path=args.dataset, seed=args.seed)
+    identical = [r["response"] for r in replay.get_responses(messages)] == [results[m]["response"] for m in messages]
+    print(f"Seed {args.seed}: dua engine memilih respons yang sama untuk {len(messages)} pesan: {identical}")
+
+    def pydantic_body(message):
+        result = results[message]
+        model = ResponChat(pesan_pengguna=message, respon_bot=result["response"],
+                           intent=result["intent"], kepercayaan=result["confidence"])
+        return json.dumps(model.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    items = messages * args.repeat
+    print(f"\nSerialisasi saja ({len(items)} respons), us per respons:")
+    print(f"  ResponChat + json.dumps : {per_call_us(pydantic_body, items):8.2f}")
+    print(f"  payload ter-encode      : {per_call_us(lambda m: encode_respon_chat(m, results[m]), items):8.2f}")
+
+    app = build_app(results)
+    bodies = [json.dumps({"message": m}).encode() for m in items]
+    loop = asyncio.new_event_loop()
+    mismatched = sum(
+        json.loads(loop.run_until_complete(call(app, "/lama", body)))
+        != json.loads(loop.run_until_complete(call(app, "/baru", body)))
+        for body in bodies[:len(messages)]
+    )
+    lama = loop.run_until_complete(per_request_us(app, "/lama", bodies))
+    baru = loop.run_until_complete(per_request_us(app, "/baru", bodies))
+    loop.close()
+    print(f"\nEndpoint /chat tanpa inferensi, dipanggil langsung lewat ASGI (isi JSON berbeda: {mismatched}):")
+    print(f"  response_model ResponChat: {lama:8.1f} us/permintaan")
+    print(f"  Response bytes           : {baru:8.1f} us/permintaan ({lama - baru:+.1f} us dihemat)")
+
+
+if __name__ == "__main__":
+    main()
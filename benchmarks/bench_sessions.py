@@ -0,0 +1,61 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from chatbot_engine import load_json_dataset
+from session_store import InMemorySessionStore, SqliteSessionStore
+
+
+def fill(store, session_ids, intents, rng, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        for session_id in session_ids:
+            store.get(session_id)
+            store.record(session_id, rng.choice(intents))
+    return len(session_ids) * turns / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur memori dan throughput session store")
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--sessions', type=int, default=100000)
+    parser.add_argument('--sqlite-sessions', type=int, default=20000)
+    parser.add_argument('--turns', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    intents = [intent['tag'] for intent in load_json_dataset(args.dataset)['intents']]
+    rng = random.Random(args.seed)
+    session_ids = [f"pengguna-{i:08d}" for i in range(args.sessions)]
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    store = InMemorySessionStore(max_sessions=args.sessions)
+    ops = fill(store, session_ids, intents, rng, args.turns)
+    # ID sesi juga dihitung: di server string itu berasal dari body request dan disimpan sebagai kunci
+    used = tracemalloc.get_traced_memory()[0] - baseline - sum(sys.getsizeof(s) for s in session_ids)
+    tracemalloc.stop()
+    print(f"memori : {len(store)} sesi, {used / 2**20:.1f} MB di luar ID sesi "
+          f"({used / len(store):.0f} byte/sesi), {ops:,.0f} get+record/s")
+
+    small = InMemorySessionStore(max_sessions=args.sessions // 10)
+    fill(small, session_ids, intents, rng, 1)
+    print(f"batas  : max_sessions={small.max_sessions} -> {len(small)} sesi, {small.evicted} dievict")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_store = SqliteSessionStore(os.path.join(tmp, 'sessions.db'))
+        ops = fill(sqlite_store, session_ids[:args.sqlite_sessions], intents, rng, args.turns)
+        size = os.path.getsize(os.path.join(tmp, 'sessions.db'))
+        print(f"sqlite : {len(sqlite_store)} sesi, {ops:,.0f} get+record/s, berkas {size / 2**20:.1f} MB")
+        sqlite_store.close()
+
+
+if __name__ == "__main__":
+    main()
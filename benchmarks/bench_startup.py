@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from chatbot_engine import ChatbotEngine
+imported = time.perf_counter()
+import sklearn.linear_model, sklearn.feature_extraction.text
+sklearn_ready = time.perf_counter()
+ChatbotEngine(model_dir=sys.argv[1], dataset_path=sys.argv[2], use_bundle=sys.argv[3] == '1')
+ready = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "sklearn_import_ms": (sklearn_ready - imported) * 1000,
+    "init_ms": (ready - sklearn_ready) * 1000,
+}))
+"""
+
+
+def measure(model_dir, dataset_path, use_bundle, runs):
+    results = []
+    env = dict(os.environ, PYTHONWARNINGS='ignore')
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', SNIPPET, model_dir, dataset_path, '1' if use_bundle else '0'],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        key: statistics.median(r[key] for r in results)
+        for key in ("import_ms", "sklearn_import_ms", "init_ms")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan waktu startup pickle vs bundle")
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    from model_bundle import find_bundle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = os.path.join(tmp, 'models')
+        shutil.copytree(args.model_dir, model_dir)
+        if not find_bundle(model_dir):
+            import pickle
+            from model_bundle import export_bundle
+            with open(f'{model_dir}/vectorizer.pkl', 'rb') as f:
+                vectorizer = pickle.load(f)
+            with open(f'{model_dir}/model.pkl', 'rb') as f:
+                model = pickle.load(f)
+            export_bundle(vectorizer, model, args.dataset, model_dir)
+
+        for label, use_bundle in (("pickle", False), ("bundle", True)):
+            result = measure(model_dir, args.dataset, use_bundle, args.runs)
+            print(f"{label:>6}: import={result['import_ms']:7.1f} ms  "
+                  f"sklearn={result['sklearn_import_ms']:7.1f} ms  init={result['init_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chatbot_engine import USE_STEMMER, _create_stemmer, load_json_dataset, normalize_text
+from corpus import mutate_text
+from stem_table import StemTable
+from train_model import collect_stem_words
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import chatbot_engine
+imported = time.perf_counter()
+if sys.argv[1] == '1':
+    chatbot_engine.get_stemmer()
+print(json.dumps({"import_s": imported - start, "total_s": time.perf_counter() - start}))
+"""
+
+
+def measure_import(eager, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', SNIPPET, '1' if eager else '0'],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1])["total_s"])
+    return statistics.median(results)
+
+
+def per_message_us(fn, texts):
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - start) * 1e6 / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan stemmer Sastrawi dengan tabel stem hasil training")
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--import-runs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not USE_STEMMER:
+        sys.exit("Sastrawi tidak terpasang; tidak ada yang dibandingkan")
+
+    data = load_json_dataset(args.dataset)
+    patterns = [p for intent in data['intents'] for p in intent['patterns']]
+    rng = random.Random(args.seed)
+    traffic = {
+        "pola dataset": [normalize_text(rng.choice(patterns)) for _ in range(args.messages)],
+        # Mirip lalu lintas nyata: typo/kata pengisi, jadi sebagian kata tidak ada di tabel
+        "pola + typo": [normalize_text(mutate_text(rng.choice(patterns), rng)) for _ in range(args.messages)],
+    }
+
+    lazy_s = measure_import(False, args.import_runs)
+    eager_s = measure_import(True, args.import_runs)
+    print(f"Import chatbot_engine (median {args.import_runs} proses):")
+    print(f"  Sastrawi dibuat saat import (jalur lama): {eager_s * 1000:8.1f} ms")
+    print(f"  Sastrawi lazy                          : {lazy_s * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    built = StemTable(_create_stemmer)
+    built.build(collect_stem_words(args.dataset))
+    print(f"\nTabel stem: {len(built.table)} kata, dibangun dalam {time.perf_counter() - start:.2f} s")
+
+    print(f"\nStemming per pesan ({args.messages} pesan; 'dingin' = cache kata Sastrawi masih kosong), us:")
+    print(f"{'lalu lintas':<14} {'OOV':>6} {'Sastrawi dingin':>16} {'hangat':>8} {'tabel dingin':>13} {'hangat':>8} {'beda':>5}")
+    for name, messages in traffic.items():
+        # Stemmer baru untuk kedua jalur supaya cache kata internal Sastrawi sama-sama mulai kosong
+        sastrawi = _create_stemmer()
+        table = StemTable(_create_stemmer)
+        table.table = built.table
+        table.stemmer
+        legacy_cold = per_message_us(sastrawi.stem, messages)
+        legacy_warm = per_message_us(sastrawi.stem, messages)
+        table_cold = per_message_us(table.stem, messages)
+        table_warm = per_message_us(table.stem, messages)
+
+        words = [word for text in messages for word in text.split()]
+        oov = sum(word not in built.table for word in words) / len(words)
+        mismatched = sum(table.stem(text) != sastrawi.stem(text) for text in messages)
+        print(f"{name:<14} {oov:6.1%} {legacy_cold:16.1f} {legacy_warm:8.1f} "
+              f"{table_cold:13.1f} {table_warm:8.1f} {mismatched:5d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import synthetic_dataset
+from tenant_registry import TenantRegistry, rss_bytes
+
+SNIPPET = """
+import sys
+from chatbot_engine import ChatbotEngine
+ChatbotEngine(model_dir=sys.argv[1], dataset_path=sys.argv[2]).get_response("Apa itu serum?")
+with open('/proc/self/statm') as f:
+    print(int(f.read().split()[1]) * 4096)
+"""
+
+KUERI = ["Halo", "Apa itu serum?", "Cara pemesanan", "Metode pembayaran"]
+
+
+def make_tenants(root, model_dir, dataset_path, count):
+    with open(dataset_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    tenants = []
+    for i in range(count):
+        tenant_id = f"toko-{i:02d}"
+        tenant_dir = os.path.join(root, tenant_id)
+        os.makedirs(os.path.join(tenant_dir, 'models'))
+        for name in ('model.pkl', 'vectorizer.pkl'):
+            shutil.copy(os.path.join(model_dir, name), os.path.join(tenant_dir, 'models', name))
+        # Pola tiap toko sedikit berbeda supaya indeks pola tidak identik
+        with open(os.path.join(tenant_dir, 'datasets.json'), 'w', encoding='utf-8') as f:
+            json.dump(synthetic_dataset(data, 2, seed=i), f, ensure_ascii=False)
+        tenants.append(tenant_id)
+    return tenants
+
+
+def single_process_rss(model_dir, dataset_path):
+    env = dict(os.environ, PYTHONWARNINGS='ignore')
+    output = subprocess.run(
+        [sys.executable, '-c', SNIPPET, model_dir, dataset_path],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return int(output.strip().splitlines()[-1])
+
+
+def create_engine(model_dir, dataset_path):
+    from chatbot_engine import ChatbotEngine
+    return ChatbotEngine(model_dir=model_dir, dataset_path=dataset_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur memori dan waktu muat dingin registry multi-tenant")
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--tenants', type=int, default=6)
+    parser.add_argument('--budget-tenants', type=float, default=2.5,
+                        help="anggaran memori untuk uji eviksi, dalam kelipatan memori satu tenant")
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    import warnings
+    warnings.filterwarnings('ignore')
+    # Impor modul bersama lebih dulu seperti di main.py (engine utama), supaya tidak ikut terhitung ke tenant pertama
+    import sklearn.feature_extraction.text, sklearn.linear_model
+    from chatbot_engine import get_stemmer
+    get_stemmer()
+
+    with tempfile.TemporaryDirectory() as root:
+        tenants = make_tenants(root, args.model_dir, args.dataset, args.tenants)
+        single_mb = single_process_rss(*TenantRegistry(root, None).paths(tenants[0])) / 2**20
+
+        base = rss_bytes()
+        registry = TenantRegistry(root, create_engine, memory_budget=2**40)
+        print("Muat pertama tiap tenant di-trace (tracemalloc) untuk mengukur memorinya:")
+        print(f"{'tenant':<10} {'muat dingin ms':>15} {'memori MB':>10} {'us/pesan hangat':>16}")
+        for tenant_id in tenants:
+            engine = registry.get(tenant_id)
+            start = time.perf_counter()
+            for query in KUERI * 25:
+                engine.get_response(query)
+            warm_us = (time.perf_counter() - start) * 1e6 / (len(KUERI) * 25)
+            tenant = registry.stats()["tenants"][tenant_id]
+            print(f"{tenant_id:<10} {tenant['load_ms']:15.1f} {tenant['memory_mb']:10.2f} {warm_us:16.1f}")
+        total_mb = (rss_bytes() - base) / 2**20
+        per_tenant_mb = statistics.median(t["memory_mb"] for t in registry.stats()["tenants"].values())
+
+        print(f"\n{args.tenants} toko, satu proses per toko : {single_mb * args.tenants:8.1f} MB "
+              f"({single_mb:.1f} MB per proses)")
+        print(f"{args.tenants} toko, satu proses registry: {base / 2**20 + total_mb:8.1f} MB "
+              f"(+{total_mb / args.tenants:.1f} MB RSS per tenant)")
+
+        budget = int(per_tenant_mb * args.budget_tenants * 2**20)
+        # Registry yang sama: memori tiap tenant sudah terukur, jadi pemuatan ulang tidak di-trace
+        registry.memory_budget = budget
+        for tenant_id in tenants:
+            registry.unload(tenant_id)
+        loads, evicted = registry.loads, registry.evicted
+        latencies = []
+        for _ in range(args.rounds):
+            for tenant_id in tenants:
+                start = time.perf_counter()
+                registry.get(tenant_id).get_response("Halo")
+                latencies.append((time.perf_counter() - start) * 1000)
+        stats = registry.stats()
+        print(f"\nAnggaran {budget / 2**20:.1f} MB, akses bergiliran {args.rounds}x ke {args.tenants} toko: "
+              f"dimuat {stats['loads'] - loads}x, dikeluarkan {stats['evicted'] - evicted}x, "
+              f"tetap dimuat {stats['loaded']}")
+        print(f"  latensi permintaan (termasuk muat dingin): median {statistics.median(latencies):.1f} ms, "
+              f"maks {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import json
+import os
+import random
+import string
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+KATA_PENGISI = ['dong', 'ya', 'kak', 'min', 'nih', 'sih', 'deh', 'gan', 'sis', 'yah']
+
+
+def mutate_text(text, rng):
+    words = text.split()
+    op = rng.random()
+    if op < 0.3 and len(words) > 1:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    elif op < 0.6:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(KATA_PENGISI))
+    elif words:
+        i = rng.randrange(len(words))
+        word = words[i]
+        pos = rng.randrange(len(word) + 1)
+        words[i] = word[:pos] + rng.choice(string.ascii_lowercase) + word[pos:]
+    return ' '.join(words)
+
+
+def garble_text(text, rng):
+    chars = list(text.lower().replace(' ', ''))
+    rng.shuffle(chars)
+    cut = max(3, len(chars) // 2)
+    return ''.join(chars[:cut]) + ' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(4))
+
+
+def synthetic_dataset(data, multiple, seed=42):
+    rng = random.Random(seed)
+    intents = []
+    for intent in data['intents']:
+        patterns = list(intent['patterns'])
+        for _ in range(multiple - 1):
+            patterns.extend(mutate_text(p, rng) for p in intent['patterns'])
+        intents.append(dict(intent, patterns=patterns))
+    return {"intents": intents}
+
+
+def write_synthetic_dataset(dataset_path, multiple, output_dir, seed=42):
+    with open(dataset_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    path = os.path.join(output_dir, f'datasets_{multiple}x.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_dataset(data, multiple, seed), f, ensure_ascii=False)
+    return path
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+PESAN_CONTOH = [
+    "Halo",
+    "Apa itu serum?",
+    "Rekomendasi untuk kulit berjerawat",
+    "Cara pemesanan",
+    "Metode pembayaran",
+    "Jam operasional",
+    "gmn cara pake toner yg bener",
+    "kulit aku berminyak bgt, pake apa ya",
+]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(client, url, concurrency, total_requests):
+    latencies = []
+    status_counts = {}
+    counter = iter(range(total_requests))
+
+    async def worker():
+        for i in counter:
+            message = PESAN_CONTOH[i % len(PESAN_CONTOH)]
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json={"message": message})
+                status = response.status_code
+            except httpx.HTTPError:
+                status = "error"
+            elapsed = (time.perf_counter() - start) * 1000
+            status_counts[status] = status_counts.get(status, 0) + 1
+            if status == 200:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "throughput_rps": total_requests / duration,
+        "p50_ms": percentile(latencies, 0.50),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "status": status_counts,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Uji beban endpoint /chat")
+    parser.add_argument('--url', default='http://127.0.0.1:8000/chat')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for concurrency in args.concurrency:
+            result = await run_level(client, args.url, concurrency, args.requests)
+            print(f"c={result['concurrency']:>3}  {result['throughput_rps']:8.1f} req/s  "
+                  f"p50={result['p50_ms']:7.1f} ms  p99={result['p99_ms']:7.1f} ms  "
+                  f"status={result['status']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
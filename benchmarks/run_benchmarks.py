@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import ROOT, garble_text, mutate_text, write_synthetic_dataset
+
+sys.path.insert(0, ROOT)
+
+from chatbot_engine import ChatbotEngine, load_json_dataset, preprocess_text
+
+# True berarti nilai lebih besar lebih baik (throughput); False untuk latensi/durasi.
+ARAH_METRIK = {
+    "preprocess_msgs_per_s": True,
+    "predict_high_confidence_p50_ms": False,
+    "predict_high_confidence_p99_ms": False,
+    "predict_fallback_p50_ms": False,
+    "predict_fallback_p99_ms": False,
+    "engine_cold_start_ms": False,
+    "load_dataset_s": False,
+    "http_chat_rps": True,
+}
+
+COLD_START_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from chatbot_engine import ChatbotEngine
+ChatbotEngine(model_dir=sys.argv[1], dataset_path=sys.argv[2])
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def timed_calls(fn, inputs):
+    latencies = []
+    for value in inputs:
+        start = time.perf_counter()
+        fn(value)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def split_by_confidence(engine, candidates, threshold=0.15):
+    high, low = [], []
+    for message in candidates:
+        processed = engine.preprocess_text(message)
+        confidence = engine.model.predict_proba(engine.vectorizer.transform([processed]))[0].max()
+        (high if confidence >= threshold else low).append(message)
+    return high, low
+
+
+def bench_preprocess(messages, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            preprocess_text(message)
+    return repeat * len(messages) / (time.perf_counter() - start)
+
+
+def bench_cold_start(model_dir, dataset_path, runs):
+    timings = []
+    env = dict(os.environ, PYTHONWARNINGS='ignore')
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_START_SNIPPET, model_dir, dataset_path],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def bench_load_dataset(dataset_path):
+    from train_model import load_dataset
+    start = time.perf_counter()
+    load_dataset(dataset_path, augment=True)
+    return time.perf_counter() - start
+
+
+async def _http_throughput(app, messages, concurrency):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    counter = iter(range(len(messages)))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for message in messages[:20]:
+            await client.post("/chat", json={"message": message})
+
+        async def worker():
+            for i in counter:
+                response = await client.post("/chat", json={"message": messages[i]})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return len(messages) / (time.perf_counter() - start)
+
+
+def bench_http(model_dir, dataset_path, messages, concurrency):
+    import main
+
+    main.manager.engine_factory = lambda: ChatbotEngine(model_dir=model_dir, dataset_path=dataset_path)
+    main.manager.reload()
+    return asyncio.run(_http_throughput(main.app, messages, concurrency))
+
+
+def run_size(multiple, args, tmp):
+    dataset_path = write_synthetic_dataset(args.dataset, multiple, tmp, args.seed)
+    rng = random.Random(args.seed)
+    data = load_json_dataset(args.dataset)
+    base = [p for intent in data['intents'] for p in intent['patterns']]
+    messages = [mutate_text(rng.choice(base), rng) for _ in range(args.messages)]
+
+    engine = ChatbotEngine(model_dir=args.model_dir, dataset_path=dataset_path)
+    high, _ = split_by_confidence(engine, messages)
+    _, low = split_by_confidence(engine, [garble_text(rng.choice(base), rng) for _ in range(args.messages * 3)])
+    low = low[:args.messages]
+
+    high_latency = timed_calls(engine.predict_intent, high)
+    low_latency = timed_calls(engine.predict_intent, low)
+
+    result = {
+        "patterns": len(engine.all_patterns),
+        "preprocess_msgs_per_s": bench_preprocess(messages),
+        "predict_high_confidence_p50_ms": percentile(high_latency, 0.5),
+        "predict_high_confidence_p99_ms": percentile(high_latency, 0.99),
+        "predict_fallback_p50_ms": percentile(low_latency, 0.5),
+        "predict_fallback_p99_ms": percentile(low_latency, 0.99),
+        "engine_cold_start_ms": bench_cold_start(args.model_dir, dataset_path, args.cold_start_runs),
+        "http_chat_rps": bench_http(args.model_dir, dataset_path, messages, args.concurrency),
+    }
+    if multiple in args.load_dataset_sizes:
+        result["load_dataset_s"] = bench_load_dataset(dataset_path)
+    return result
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for size, metrics in results.items():
+        for name, value in metrics.items():
+            if name not in ARAH_METRIK or name not in baseline.get(size, {}):
+                continue
+            old = baseline[size][name]
+            if old <= 0:
+                continue
+            change = (value - old) / old
+            worse = -change if ARAH_METRIK[name] else change
+            status = "REGRESI" if worse > threshold else "ok"
+            print(f"  {size:>5} {name:<34} {old:12.3f} -> {value:12.3f} ({change:+.1%}) {status}")
+            if worse > threshold:
+                regressions.append((size, name))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark engine, training dan HTTP")
+    parser.add_argument('--dataset', default=os.path.join(ROOT, 'datasets.json'))
+    parser.add_argument('--model-dir', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--load-dataset-sizes', type=int, nargs='*', default=[1, 10],
+                        help="ukuran korpus yang juga diukur augmentasi load_dataset-nya")
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--cold-start-runs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="simpan hasil sebagai JSON")
+    parser.add_argument('--baseline', help="JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="batas regresi relatif sebelum keluar dengan status gagal")
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for multiple in args.sizes:
+            print(f"Menjalankan benchmark korpus {multiple}x...")
+            results[f"{multiple}x"] = run_size(multiple, args, tmp)
+            for name, value in results[f"{multiple}x"].items():
+                print(f"  {name:<34} {value:12.3f}")
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Hasil disimpan di {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        print(f"Perbandingan dengan {args.baseline} (batas {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metrik mengalami regresi")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
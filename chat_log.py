@@ -0,0 +1,289 @@
+import gzip
+import itertools
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+
+FIELDS = ("ts", "tenant_id", "message", "intent", "confidence", "fallback")
+FORMATS = ("jsonl", "parquet")
+SUFFIXES = (".jsonl.gz", ".jsonl", ".parquet")
+PART = ".part"
+
+# Segmen yang sedang ditulis oleh logger di proses ini; tidak boleh "dipulihkan" oleh logger lain
+_open_segments = set()
+# Nomor urut segmen per proses, supaya dua logger di detik yang sama tidak memakai nama yang sama
+_segment_sequence = itertools.count(1)
+
+
+class JsonlSegment:
+    suffix = ".jsonl.gz"
+
+    def __init__(self, path):
+        self.f = gzip.open(path, "wt", encoding="utf-8")
+        self.bytes = 0
+
+    def write(self, records):
+        lines = "".join(json.dumps(dict(zip(FIELDS, record)), ensure_ascii=False) + "\n" for record in records)
+        self.f.write(lines)
+        # Sync flush per batch: isi .part tetap bisa dibaca sampai batch terakhir bila proses mati
+        self.f.flush()
+        self.bytes += len(lines)
+
+    def close(self):
+        self.f.close()
+
+
+class ParquetSegment:
+    """Kolumnar; satu row group per batch. Butuh pyarrow (opsional, tidak ada di requirements.txt)."""
+
+    suffix = ".parquet"
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Format log parquet membutuhkan pyarrow. Jalankan: pip install pyarrow")
+        self.pa = pa
+        self.schema = pa.schema([
+            ("ts", pa.float64()),
+            ("tenant_id", pa.string()),
+            ("message", pa.string()),
+            ("intent", pa.string()),
+            ("confidence", pa.float64()),
+            ("fallback", pa.bool_()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        self.bytes = 0
+
+    def write(self, records):
+        columns = zip(*records)
+        table = self.pa.Table.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema,
+        )
+        self.writer.write_table(table)
+        self.bytes += table.nbytes
+
+    def close(self):
+        self.writer.close()
+
+
+SEGMENTS = {"jsonl": JsonlSegment, "parquet": ParquetSegment}
+
+
+class ChatLogger:
+    """Log pesan chat lewat ring buffer; thread latar menulisnya per batch ke segmen yang dirotasi menurut umur atau ukuran."""
+
+    def __init__(self, directory, fmt="jsonl", capacity=10000, batch_size=500, flush_interval=1.0,
+                 rotate_bytes=64 * 2**20, rotate_seconds=60, prefix="chat"):
+        # rotate_bytes: data sebelum kompresi (JSONL) atau byte Arrow (Parquet), bukan ukuran berkas di disk.
+        # Buffer penuh menimpa catatan paling lama dan menghitungnya di `dropped`.
+        if fmt not in FORMATS:
+            raise ValueError(f"Format log tidak dikenal: {fmt}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.prefix = prefix
+        self._buffer = deque(maxlen=capacity)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._segment = None
+        self._segment_path = None
+        self._segment_opened = 0.0
+        self.written = 0
+        self.dropped = 0
+        self.files = 0
+        self.recovered = 0
+        self.unrecoverable = 0
+        self.last_error = None
+        self._recover_segments()
+        # Buka segmen pertama sekarang supaya kesalahan konfigurasi (mis. pyarrow tidak ada) muncul saat startup
+        self._open_segment()
+        self._thread = threading.Thread(target=self._run, name="penulis-log-chat", daemon=True)
+        self._thread.start()
+
+    def log(self, message, intent, confidence, fallback, tenant_id=None):
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append((time.time(), tenant_id, message, str(intent), float(confidence), bool(fallback)))
+        if len(buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _recover_segments(self):
+        # Segmen *.part milik proses yang sudah mati (SIGKILL, OOM) tidak pernah di-rename, jadi tidak terlihat
+        # oleh pembaca. JSONL diselamatkan sampai batch terakhir yang utuh; Parquet tanpa footer tidak bisa
+        # dibaca dan diganti namanya menjadi *.rusak.
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(PART) or path in _open_segments:
+                continue
+            final_path = path[:-len(PART)]
+            try:
+                pid = int(final_path.rsplit("-", 2)[1])
+            except (IndexError, ValueError):
+                continue
+            # Proses lain yang masih hidup mungkin sedang menulis ke direktori yang sama
+            if pid != os.getpid() and process_alive(pid):
+                continue
+            try:
+                if final_path.endswith(".jsonl.gz"):
+                    recovered = recover_jsonl(path, final_path)
+                    self.recovered += recovered
+                    if recovered:
+                        self.files += 1
+                else:
+                    os.replace(path, final_path + ".rusak")
+                    self.unrecoverable += 1
+            except OSError as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Gagal memulihkan segmen log {name}: {e}")
+
+    def _open_segment(self):
+        name = f"{self.prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_segment_sequence):04d}"
+        segment_class = SEGMENTS[self.fmt]
+        self._segment_path = os.path.join(self.directory, name + segment_class.suffix)
+        self._segment = segment_class(self._segment_path + PART)
+        _open_segments.add(self._segment_path + PART)
+        self._segment_opened = time.monotonic()
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        self._segment.close()
+        part_path = self._segment_path + PART
+        if self._segment.bytes:
+            os.replace(part_path, self._segment_path)
+            self.files += 1
+        else:
+            os.remove(part_path)
+        _open_segments.discard(part_path)
+        self._segment = None
+
+    def _flush(self):
+        buffer = self._buffer
+        while buffer:
+            batch = []
+            while buffer and len(batch) < self.batch_size:
+                batch.append(buffer.popleft())
+            try:
+                if self._segment is None:
+                    self._open_segment()
+                self._segment.write(batch)
+                self.written += len(batch)
+            except (OSError, ValueError) as e:
+                self.dropped += len(batch)
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Gagal menulis log chat: {e}")
+
+        if self._segment is not None and (
+            self._segment.bytes >= self.rotate_bytes
+            or (self._segment.bytes and time.monotonic() - self._segment_opened >= self.rotate_seconds)
+        ):
+            self._close_segment()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush()
+        self._flush()
+        self._close_segment()
+
+    def close(self, timeout=10):
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "format": self.fmt,
+            "directory": self.directory,
+            "capacity": self._buffer.maxlen,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "files": self.files,
+            "recovered": self.recovered,
+            "unrecoverable": self.unrecoverable,
+            "last_error": self.last_error,
+        }
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def recover_jsonl(part_path, final_path):
+    """Salin baris JSON yang utuh dari segmen gzip terpotong ke `final_path`; kembalikan jumlah catatan."""
+    # zlib langsung, bukan gzip.open: data sebelum titik potong tetap keluar tanpa EOFError
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    data = []
+    with open(part_path, "rb") as f:
+        try:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                data.append(decompressor.decompress(chunk))
+        except zlib.error:
+            pass
+    lines = b"".join(data).decode("utf-8", errors="replace").splitlines(keepends=True)
+    complete = []
+    for line in lines:
+        # Baris terakhir tanpa newline terpotong di tengah batch
+        if not line.endswith("\n"):
+            continue
+        try:
+            json.loads(line)
+        except ValueError:
+            continue
+        complete.append(line)
+    if complete:
+        with gzip.open(final_path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write("".join(complete))
+        os.replace(final_path + ".tmp", final_path)
+    os.remove(part_path)
+    return len(complete)
+
+
+def is_log_path(path):
+    return os.path.isdir(path) or path.endswith((".jsonl.gz", ".parquet"))
+
+
+def log_files(path):
+    """Segmen log yang sudah ditutup, urut menurut nama (= waktu dibuka)."""
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(SUFFIXES))
+
+
+def iter_log_records(path):
+    for file_path in log_files(path):
+        if file_path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(file_path).iter_batches():
+                yield from batch.to_pylist()
+            continue
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("message"), str):
+                    yield record
@@ -1,16 +1,27 @@
 import re
 import json
+import hashlib
+import importlib.util
 import pickle
 import random
+from collections import Counter
 from difflib import SequenceMatcher
 
-try:
+import numpy as np
+
+from chat_log import is_log_path, iter_log_records
+from fuzzy_index import PatternIndex
+from model_bundle import ModelBundle, find_bundle
+from stem_table import StemTable
+from text_cache import PreprocessCache
+from text_normalizer import TextNormalizer
+
+# Sastrawi hanya dicek keberadaannya; kamusnya baru dibangun saat ada kata di luar tabel stem
+USE_STEMMER = importlib.util.find_spec('Sastrawi') is not None
+
+def _create_stemmer():
     from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-    stemmer = StemmerFactory().create_stemmer()
-    USE_STEMMER = True
-except ImportError:
-    USE_STEMMER = False
-    stemmer = None
+    return StemmerFactory().create_stemmer()
 
 SLANG_DICTIONARY = {
     'gw': 'saya', 'gue': 'saya', 'gua': 'saya', 'aku': 'saya', 'ak': 'saya', 'w': 'saya',
@@ -114,37 +125,103 @@ CHAR_REPLACEMENTS = {
     '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '@': 'a',
 }
 
+PREPROCESS_VERSION = 2
+
+# Pesan lanjutan sependek ini boleh diselesaikan memakai topik intent sebelumnya.
+FOLLOWUP_MAX_WORDS = 4
+
+# Jumlah intent teratas dari model yang polanya diperiksa oleh fallback fuzzy.
+FALLBACK_TOP_K = 10
+
+# Tahap kaskade yang berarti model sendiri tidak cukup yakin.
+FALLBACK_STAGES = ("fuzzy", "unknown")
+
+UNKNOWN_RESPONSE = "Maaf, saya kurang mengerti pertanyaan Anda. Bisa diulang dengan kata-kata yang berbeda? Atau ketik 'bantuan' untuk melihat apa yang bisa saya bantu."
+MISSING_RESPONSE = "Maaf, saya tidak memiliki jawaban untuk itu."
+
+normalizer = TextNormalizer(SLANG_DICTIONARY, CHAR_REPLACEMENTS)
+stem_table = StemTable(_create_stemmer)
+
 def normalize_repeated_chars(text):
-    return re.sub(r'(.)\1{2,}', r'\1', text)
+    return normalizer.normalize_repeated_chars(text)
 
 def normalize_slang(text):
-    words = text.split()
-    normalized = []
-    for word in words:
-        lower_word = word.lower()
-        if lower_word in SLANG_DICTIONARY:
-            replacement = SLANG_DICTIONARY[lower_word]
-            if replacement:
-                normalized.append(replacement)
-        else:
-            normalized.append(word)
-    return ' '.join(normalized)
+    return normalizer.normalize_slang(text)
 
 def normalize_leet(text):
-    for char, replacement in CHAR_REPLACEMENTS.items():
-        text = text.replace(char, replacement)
+    return normalizer.normalize_leet(text)
+
+def normalize_text(text):
+    return normalizer.normalize(text)
+
+def get_stemmer():
+    return stem_table.stemmer if USE_STEMMER else None
+
+def stem_text(text, cache=None):
+    if USE_STEMMER:
+        return stem_table.stem(text, cache)
     return text
 
-def preprocess_text(text):
-    text = text.lower()
-    text = normalize_leet(text)
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    text = normalize_repeated_chars(text)
-    text = normalize_slang(text)
-    text = re.sub(r'\s+', ' ', text)
-    if USE_STEMMER and stemmer:
-        text = stemmer.stem(text)
-    return text.strip()
+def preprocess_text(text, cache=None, metrics=None):
+    if cache is not None:
+        cached = cache.lookup(text)
+        if cached is not None:
+            return cached
+
+    if metrics is None:
+        result = stem_text(normalize_text(text), cache).strip()
+    else:
+        with metrics.timer("normalize"):
+            result = normalize_text(text)
+        with metrics.timer("stem"):
+            result = stem_text(result, cache).strip()
+
+    if cache is not None:
+        cache.store(text, result)
+    return result
+
+def preprocess_fingerprint():
+    payload = json.dumps([PREPROCESS_VERSION, SLANG_DICTIONARY, CHAR_REPLACEMENTS, USE_STEMMER], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def encode_json(value):
+    # Sama dengan serialisasi JSON FastAPI (UTF-8, tanpa escape non-ASCII)
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+def intent_topic(intent):
+    """Topik produk dari tag seperti 'serum_info' atau 'vitamin_c_usage'; None untuk intent lain."""
+    for suffix in ('_info', '_usage'):
+        if intent.endswith(suffix):
+            return intent[:-len(suffix)].replace('_', ' ')
+    return None
+
+def iter_response_chunks(text, words_per_chunk=8):
+    words = re.findall(r'\S+\s*', text)
+    for i in range(0, len(words), words_per_chunk):
+        yield ''.join(words[i:i + words_per_chunk])
+
+def load_hot_queries(path, limit=50):
+    """Ambil `limit` pesan paling sering dari log teks (satu pesan per baris), JSONL ({"message": ...}),
+    atau log chat dari ChatLogger (direktori, .jsonl.gz, .parquet)."""
+    if not path or limit <= 0:
+        return []
+    counts = Counter()
+    if is_log_path(path):
+        counts.update(record['message'] for record in iter_log_records(path))
+        return [message for message, _ in counts.most_common(limit)]
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                try:
+                    line = json.loads(line).get('message', '')
+                except ValueError:
+                    continue
+            if line:
+                counts[line] += 1
+    return [message for message, _ in counts.most_common(limit)]
 
 def load_json_dataset(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -154,97 +231,355 @@ def calculate_similarity(text1, text2):
     return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
 
 class ChatbotEngine:
-    def __init__(self, model_dir='models', dataset_path='datasets.json'):
+    def __init__(self, model_dir='models', dataset_path='datasets.json',
+                 cache_size=0, stem_cache_size=0, cache_path=None, use_bundle=True, backend='sklearn',
+                 metrics=None, exact_match=True, fallback_top_k=FALLBACK_TOP_K, compact=False,
+                 preprocess_cache=None, seed=None):
+        if backend not in ('sklearn', 'numpy'):
+            raise ValueError(f"Backend tidak dikenal: {backend}")
         self.model_dir = model_dir
         self.dataset_path = dataset_path
+        self.compact = compact
+        self.backend = 'numpy' if compact else backend
+        self.use_bundle = use_bundle or self.backend == 'numpy'
+        self.metrics = metrics
+        self.exact_match = exact_match
+        self.hot_intents = {}
+        self._hot_threshold = None
+        # RNG per engine: hasil bisa direproduksi dengan seed dan tidak berbagi state dengan modul random
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.fallback_top_k = fallback_top_k
+        self.bundle = None
         self.all_patterns = []
         self.pattern_to_intent = {}
+        self.exact_intents = {}
+        self.ambiguous_patterns = set()
+        self.topic_texts = {}
+
+        self.stem_table_path = f'{model_dir}/stem_table.json'
+        # Cache dari luar dipakai bersama beberapa engine (mis. antar-tenant); preprocessing tidak bergantung model
+        self.preprocess_cache = preprocess_cache
+        self.cache_path = cache_path or f'{model_dir}/preprocess_cache.json'
+        if preprocess_cache is None and (cache_size > 0 or stem_cache_size > 0):
+            self.preprocess_cache = PreprocessCache(
+                sentence_size=cache_size,
+                stem_size=stem_cache_size,
+                fingerprint=preprocess_fingerprint(),
+            )
+            self.preprocess_cache.load(self.cache_path)
+
         self.load_model()
 
     def preprocess_text(self, text):
-        return preprocess_text(text)
+        return preprocess_text(text, self.preprocess_cache, self.metrics)
+
+    def cache_stats(self):
+        if self.preprocess_cache is None:
+            return None
+        return self.preprocess_cache.stats()
+
+    def save_cache(self):
+        if self.preprocess_cache is None:
+            return False
+        self.preprocess_cache.save(self.cache_path)
+        return True
 
     def load_model(self):
-        with open(f'{self.model_dir}/vectorizer.pkl', 'rb') as f:
-            self.vectorizer = pickle.load(f)
-
-        with open(f'{self.model_dir}/model.pkl', 'rb') as f:
-            self.model = pickle.load(f)
-
-        data = load_json_dataset(self.dataset_path)
-        self.intent_responses = {}
-        for intent in data['intents']:
-            tag = intent['tag']
-            self.intent_responses[tag] = intent['responses']
-            for pattern in intent['patterns']:
-                processed = preprocess_text(pattern)
+        stem_table.load(self.stem_table_path, preprocess_fingerprint())
+
+        bundle_name = 'compact' if self.compact else 'bundle'
+        bundle_dir = find_bundle(self.model_dir, bundle_name) if self.use_bundle else None
+        if self.backend == 'numpy' and not bundle_dir:
+            command = "python train_model.py --compact" if self.compact else "python model_bundle.py"
+            raise FileNotFoundError(
+                f"Bundle model tidak ditemukan di {self.model_dir}/{bundle_name}. Jalankan: {command}"
+            )
+
+        if bundle_dir:
+            self.bundle = ModelBundle(bundle_dir)
+            if self.backend == 'numpy':
+                self.vectorizer, self.model = self.bundle.to_numpy()
+            else:
+                self.vectorizer, self.model = self.bundle.to_sklearn()
+        else:
+            with open(f'{self.model_dir}/vectorizer.pkl', 'rb') as f:
+                self.vectorizer = pickle.load(f)
+
+            with open(f'{self.model_dir}/model.pkl', 'rb') as f:
+                self.model = pickle.load(f)
+
+        pattern_tags = []
+        if self.bundle is not None and self.bundle.matches_dataset(self.dataset_path, preprocess_fingerprint()):
+            self.intent_responses = self.bundle.intent_responses
+            for processed, tag in self.bundle.patterns:
                 self.all_patterns.append(processed)
+                pattern_tags.append(tag)
                 self.pattern_to_intent[processed] = tag
+        else:
+            data = load_json_dataset(self.dataset_path)
+            self.intent_responses = {}
+            for intent in data['intents']:
+                tag = intent['tag']
+                self.intent_responses[tag] = intent['responses']
+                for pattern in intent['patterns']:
+                    processed = preprocess_text(pattern, self.preprocess_cache)
+                    self.all_patterns.append(processed)
+                    pattern_tags.append(tag)
+                    self.pattern_to_intent[processed] = tag
 
-    def find_similar_intent(self, user_input, threshold=0.6):
-        processed_input = preprocess_text(user_input)
-        best_match = None
-        best_score = 0
+        # Pola yang sama bisa milik beberapa intent (mis. "terima kasih"); pola seperti itu tidak dijawab
+        # lewat exact match (pattern_to_intent menyimpan intent terakhir saja), jadi diserahkan ke model.
+        intents_per_pattern = {}
+        for processed, tag in zip(self.all_patterns, pattern_tags):
+            intents_per_pattern.setdefault(processed, set()).add(tag)
+        self.ambiguous_patterns = {p for p, tags in intents_per_pattern.items() if len(tags) > 1}
+        self.exact_intents = {
+            p: next(iter(tags)) for p, tags in intents_per_pattern.items() if len(tags) == 1
+        }
+
+        self.pattern_index = PatternIndex(self.all_patterns)
+        self.topic_texts = {
+            topic: preprocess_text(topic, self.preprocess_cache)
+            for topic in map(intent_topic, self.intent_responses) if topic
+        }
+        self.encoded_responses = {
+            tag: [encode_json(response) for response in responses]
+            for tag, responses in self.intent_responses.items()
+        }
+        self._encoded_fallbacks = {
+            UNKNOWN_RESPONSE: encode_json(UNKNOWN_RESPONSE),
+            MISSING_RESPONSE: encode_json(MISSING_RESPONSE),
+        }
 
-        for pattern in self.all_patterns:
-            score = calculate_similarity(processed_input, pattern)
-            if score > best_score and score >= threshold:
-                best_score = score
-                best_match = pattern
+        class_positions = {str(c): i for i, c in enumerate(self.model.classes_)}
+        class_pattern_ids = [[] for _ in class_positions]
+        for pattern_id, pattern in enumerate(self.pattern_index.patterns):
+            position = class_positions.get(self.pattern_to_intent[pattern])
+            if position is not None:
+                class_pattern_ids[position].append(pattern_id)
+        self._class_pattern_ids = [np.array(ids, dtype=np.int64) for ids in class_pattern_ids]
 
+    def _candidate_mask(self, probabilities):
+        k = self.fallback_top_k
+        if not k or k >= len(probabilities):
+            return None
+        mask = np.zeros(len(self.pattern_index), dtype=bool)
+        for class_idx in np.argpartition(-probabilities, k - 1)[:k]:
+            mask[self._class_pattern_ids[class_idx]] = True
+        return mask
+
+    def find_similar_intent(self, user_input, threshold=0.6):
+        return self._match_processed(self.preprocess_text(user_input), threshold)
+
+    def _match_processed(self, processed_input, threshold=0.6, allowed=None):
+        best_match, best_score = self.pattern_index.best_ratio_match(processed_input, threshold, allowed)
         if best_match:
             return self.pattern_to_intent[best_match], best_score
 
-        input_words = set(processed_input.split())
-        for pattern in self.all_patterns:
-            pattern_words = set(pattern.split())
-            if input_words and pattern_words:
-                overlap = len(input_words & pattern_words)
-                total = len(input_words | pattern_words)
-                if total > 0:
-                    jaccard = overlap / total
-                    if jaccard > best_score and jaccard >= 0.4:
-                        best_score = jaccard
-                        best_match = pattern
-
+        best_match, best_score = self.pattern_index.best_jaccard_match(processed_input, 0.4, allowed)
         if best_match:
             return self.pattern_to_intent[best_match], best_score
 
         return None, 0
 
     def predict_intent(self, user_input, confidence_threshold=0.15):
-        processed_input = self.preprocess_text(user_input)
-        input_vector = self.vectorizer.transform([processed_input])
+        return self.predict_intents([user_input], confidence_threshold)[0]
+
+    def predict_intents(self, user_inputs, confidence_threshold=0.15):
+        return [(intent, confidence) for intent, confidence, _ in self.predict_stages(user_inputs, confidence_threshold)]
+
+    def predict_stages(self, user_inputs, confidence_threshold=0.15):
+        """Seperti predict_intents, tetapi hasilnya (intent, confidence, tahap kaskade).
 
-        probabilities = self.model.predict_proba(input_vector)[0]
-        predicted_class_idx = probabilities.argmax()
-        confidence = probabilities[predicted_class_idx]
+        Hasil dari hot set membawa tahap aslinya, jadi fallback tetap terlihat; metrik mencatatnya sebagai "hot".
+        """
+        if not user_inputs:
+            return []
 
-        predicted_intent = self.model.classes_[predicted_class_idx]
+        hot_intents = self.hot_intents if confidence_threshold == self._hot_threshold else None
+        results = [None] * len(user_inputs)
+        stages = [None] * len(user_inputs)
+
+        rows = []
+        processed_inputs = []
+        for row, text in enumerate(user_inputs):
+            if hot_intents:
+                hot = hot_intents.get(text)
+                if hot is not None:
+                    results[row] = hot
+                    stages[row] = "hot"
+                    continue
+            rows.append(row)
+            processed_inputs.append(self.preprocess_text(text))
+
+        if rows:
+            classified = self.classify_processed(processed_inputs, confidence_threshold)
+            for row, result in zip(rows, classified):
+                results[row] = result
+                stages[row] = result[2]
+
+        if self.metrics is not None:
+            for (intent, _, _), stage in zip(results, stages):
+                self.metrics.record_prediction(intent, stage)
+        return results
+
+    def classify_processed(self, processed_inputs, confidence_threshold=0.15):
+        """Klasifikasikan teks yang sudah dipreprocess; hasil berupa (intent, confidence, tahap kaskade)."""
+        metrics = self.metrics
+        results = [None] * len(processed_inputs)
+
+        model_rows = []
+        for row, processed in enumerate(processed_inputs):
+            tag = self.exact_intents.get(processed) if self.exact_match and processed else None
+            if tag is not None:
+                results[row] = (tag, 1.0, "exact")
+            else:
+                model_rows.append(row)
+
+        if not model_rows:
+            return results
+
+        model_inputs = [processed_inputs[row] for row in model_rows]
+        if metrics is None:
+            input_vectors = self.vectorizer.transform(model_inputs)
+            probabilities = self.model.predict_proba(input_vectors)
+        else:
+            with metrics.timer("vectorize"):
+                input_vectors = self.vectorizer.transform(model_inputs)
+            with metrics.timer("predict_proba"):
+                probabilities = self.model.predict_proba(input_vectors)
+        predicted_class_idx = probabilities.argmax(axis=1)
 
-        if confidence < confidence_threshold:
-            similar_intent, similarity = self.find_similar_intent(user_input)
+        for i, row in enumerate(model_rows):
+            class_idx = predicted_class_idx[i]
+            confidence = probabilities[i, class_idx]
+
+            if confidence >= confidence_threshold:
+                results[row] = (self.model.classes_[class_idx], confidence, "model")
+                continue
+
+            allowed = self._candidate_mask(probabilities[i])
+            if metrics is None:
+                similar_intent, similarity = self._match_processed(processed_inputs[row], allowed=allowed)
+            else:
+                with metrics.timer("fallback"):
+                    similar_intent, similarity = self._match_processed(processed_inputs[row], allowed=allowed)
             if similar_intent:
-                return similar_intent, similarity
-            return "unknown", confidence
+                results[row] = (similar_intent, similarity, "fuzzy")
+            else:
+                results[row] = ("unknown", confidence, "unknown")
+        return results
 
-        return predicted_intent, confidence
+    def warm_hot_set(self, queries, confidence_threshold=0.15):
+        queries = list(dict.fromkeys(q for q in queries if q and q.strip()))
+        metrics, self.metrics = self.metrics, None
+        try:
+            self.hot_intents = {}
+            results = self.predict_stages(queries, confidence_threshold)
+        finally:
+            self.metrics = metrics
+        self._hot_threshold = confidence_threshold
+        self.hot_intents = dict(zip(queries, results))
+        return len(self.hot_intents)
 
-    def get_response(self, user_input):
-        intent, confidence = self.predict_intent(user_input)
+    def predict_with_context(self, user_input, previous_intents, confidence_threshold=0.15):
+        intent, confidence, _, resolved = self._predict_with_context(user_input, previous_intents, confidence_threshold)
+        return intent, confidence, resolved
 
-        if intent == "unknown":
-            return {
-                "intent": "unknown",
-                "confidence": float(confidence),
-                "response": "Maaf, saya kurang mengerti pertanyaan Anda. Bisa diulang dengan kata-kata yang berbeda? Atau ketik 'bantuan' untuk melihat apa yang bisa saya bantu."
-            }
+    def _predict_with_context(self, user_input, previous_intents, confidence_threshold=0.15):
+        # Pesan dipreprocess sekali; kedua klasifikasi tidak dicatat, metrik hanya mencatat intent yang dipakai
+        topic = next((t for t in map(intent_topic, reversed(previous_intents)) if t), None)
+        processed = None
+        if topic is not None:
+            processed = self.preprocess_text(user_input)
+            if len(processed.split()) > FOLLOWUP_MAX_WORDS or topic in processed:
+                topic = None
+
+        hot_intents = self.hot_intents if confidence_threshold == self._hot_threshold else None
+        hot = hot_intents.get(user_input) if hot_intents and topic is None else None
+        resolved = False
+        if hot is not None:
+            intent, confidence, stage = hot
+            recorded_stage = "hot"
+        else:
+            if processed is None:
+                processed = self.preprocess_text(user_input)
+            if topic is None:
+                intent, confidence, stage = self.classify_processed([processed], confidence_threshold)[0]
+            else:
+                # Preprocessing per kata, jadi hasil "<topik> <pesan>" = topik terpreprocess + pesan terpreprocess
+                topic_text = self.topic_texts.get(topic)
+                if topic_text is None:
+                    topic_text = self.preprocess_text(topic)
+                context_processed = f"{topic_text} {processed}".strip()
+                (intent, confidence, stage), (context_intent, context_confidence, context_stage) = (
+                    self.classify_processed([processed, context_processed], confidence_threshold)
+                )
+                if context_intent not in (intent, "unknown") and context_confidence > confidence:
+                    intent, confidence, stage = context_intent, context_confidence, context_stage
+                    resolved = True
+            recorded_stage = stage
+
+        if self.metrics is not None:
+            self.metrics.record_prediction(intent, recorded_stage)
+        return intent, confidence, stage, resolved
+
+    def session_rng(self, session_key):
+        # Dengan seed, pilihan respons per sesi deterministik (seed + kunci sesi); tanpa seed tetap acak per proses
+        if self.seed is None:
+            return self.rng
+        return random.Random(f"{self.seed}:{session_key}")
 
-        responses = self.intent_responses.get(intent, ["Maaf, saya tidak memiliki jawaban untuk itu."])
-        response_text = random.choice(responses)
+    def get_response_with_context(self, user_input, previous_intents, session_key=None):
+        intent, confidence, stage, resolved = self._predict_with_context(user_input, previous_intents)
+        rng = self.session_rng(session_key) if session_key is not None else None
+        result = self.build_response(intent, confidence, rng, stage)
+        result["from_context"] = resolved
+        return result
+
+    def top_intents(self, user_input, k=5):
+        processed = self.preprocess_text(user_input)
+        probabilities = self.model.predict_proba(self.vectorizer.transform([processed]))[0]
+        k = min(k, len(probabilities))
+        top = np.argpartition(-probabilities, k - 1)[:k]
+        top = top[np.argsort(-probabilities[top], kind='stable')]
+        return [(str(self.model.classes_[i]), float(probabilities[i])) for i in top]
+
+    def build_response(self, intent, confidence, rng=None, stage=None):
+        """`response_json` adalah `response` yang sudah di-encode sebagai string JSON UTF-8."""
+        if intent == "unknown":
+            response_text = UNKNOWN_RESPONSE
+            response_json = self._encoded_fallbacks[UNKNOWN_RESPONSE]
+        elif intent in self.intent_responses:
+            responses = self.intent_responses[intent]
+            index = (rng or self.rng).randrange(len(responses))
+            response_text = responses[index]
+            response_json = self.encoded_responses[intent][index]
+        else:
+            response_text = MISSING_RESPONSE
+            response_json = self._encoded_fallbacks[MISSING_RESPONSE]
 
         return {
             "intent": intent,
             "confidence": float(confidence),
-            "response": response_text
+            "response": response_text,
+            "response_json": response_json,
+            "fallback": stage in FALLBACK_STAGES if stage is not None else intent == "unknown"
         }
+
+    def get_response(self, user_input):
+        intent, confidence, stage = self.predict_stages([user_input])[0]
+        return self.build_response(intent, confidence, stage=stage)
+
+    def stream_response(self, user_input, words_per_chunk=8):
+        """Yield dict intent/confidence lebih dulu, lalu potongan teks respons."""
+        result = self.get_response(user_input)
+        yield {"intent": result["intent"], "confidence": result["confidence"]}
+        yield from iter_response_chunks(result["response"], words_per_chunk)
+
+    def get_responses(self, user_inputs):
+        return [
+            self.build_response(intent, confidence, stage=stage)
+            for intent, confidence, stage in self.predict_stages(user_inputs)
+        ]
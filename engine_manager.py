@@ -0,0 +1,114 @@
+import hashlib
+import os
+import threading
+import time
+
+KUERI_KANARI = [
+    "Halo",
+    "Apa itu serum?",
+    "Rekomendasi untuk kulit berjerawat",
+    "Cara pemesanan",
+    "Metode pembayaran",
+    "Jam operasional",
+]
+
+
+def model_signature(model_dir):
+    signature = []
+    for root, _, files in os.walk(model_dir):
+        for name in sorted(files):
+            if name.endswith(('.pkl', '.npy', 'meta.json', 'vocabulary.json', 'patterns.json', 'stem_table.json')):
+                stat = os.stat(os.path.join(root, name))
+                signature.append((os.path.relpath(os.path.join(root, name), model_dir), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+def model_version(signature):
+    return hashlib.sha1(repr(signature).encode('utf-8')).hexdigest()[:12]
+
+
+class EngineManager:
+    def __init__(self, engine_factory, model_dir, canary_queries=None):
+        self.engine_factory = engine_factory
+        self.model_dir = model_dir
+        self.canary_queries = KUERI_KANARI if canary_queries is None else canary_queries
+        self.engine = None
+        self.generation = 0
+        self.version = None
+        self.signature = None
+        self.loaded_at = None
+        self.last_reload_ms = None
+        self.last_error = None
+        self._listeners = []
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def reload(self):
+        with self._reload_lock:
+            start = time.perf_counter()
+            signature = model_signature(self.model_dir)
+            try:
+                engine = self.engine_factory()
+                # Kueri kanari tidak ikut dihitung di metrik layanan.
+                metrics = getattr(engine, 'metrics', None)
+                engine.metrics = None
+                for query in self.canary_queries:
+                    engine.get_response(query)
+                engine.metrics = metrics
+                # Listener (mis. pool process yang menyiapkan worker baru) boleh menolak engine ini
+                for listener in self._listeners:
+                    listener(engine)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                raise
+
+            self.engine = engine
+            self.generation += 1
+            self.signature = signature
+            self.version = model_version(signature)
+            self.loaded_at = time.time()
+            self.last_reload_ms = (time.perf_counter() - start) * 1000
+            self.last_error = None
+            return engine
+
+    def _watch(self, interval):
+        pending = None
+        while not self._stop.wait(interval):
+            signature = model_signature(self.model_dir)
+            if signature == self.signature:
+                pending = None
+                continue
+            if signature != pending:
+                pending = signature
+                continue
+            try:
+                self.reload()
+                print(f"Model dimuat ulang, versi {self.version} (generasi {self.generation})")
+            except Exception as e:
+                print(f"Gagal memuat ulang model: {e}")
+                self.signature = signature
+            pending = None
+
+    def start_watcher(self, interval):
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="pengawas-model", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+        self._watcher = None
+
+    def status(self):
+        return {
+            "versi": self.version,
+            "generasi": self.generation,
+            "dimuat_pada": self.loaded_at,
+            "durasi_muat_ulang_ms": self.last_reload_ms,
+            "error_terakhir": self.last_error,
+        }
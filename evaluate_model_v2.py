@@ -1,20 +1,34 @@
+import argparse
 import json
 import os
-import sys
-from sklearn.model_selection import train_test_split
+import pickle
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+from sklearn.model_selection import StratifiedGroupKFold, train_test_split
 from sklearn.metrics import classification_report, accuracy_score
-from train_model import load_dataset, train_model
+from train_model import build_training_rows, load_dataset, make_model, make_vectorizer, train_model
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), 'datasets.json')
+
+_X = None
+_y = None
+_folds = None
+_C_values = None
+_latency_samples = None
 
 def evaluate():
     print("Mulai Evaluasi Model Skincare Chatbot...")
-    
+
     # 1. Load Data using existing function (includes augmentation)
     print("Loading Dataset & Performing Augmentation...")
-    dataset_path = os.path.join(os.path.dirname(__file__), 'datasets.json')
-    patterns, labels = load_dataset(dataset_path, augment=True)
-    
+    patterns, labels = load_dataset(DATASET_PATH, augment=True)
+
     print(f"Total Data setelah Augmentasi: {len(patterns)}")
-    
+
     # 2. Split Data (80% Train, 20% Test)
     # Using stratify to ensure class balance
     try:
@@ -31,23 +45,23 @@ def evaluate():
             test_size=0.2,
             random_state=42
         )
-    
+
     print(f"Data Training: {len(X_train)}")
     print(f"Data Testing: {len(X_test)}")
-    
+
     # 3. Train Model
     print("Training Model (Logistic Regression)...")
     # train_model returns (vectorizer, model) and prints accuracy inside
     vectorizer, model = train_model(X_train, X_test, y_train, y_test)
-    
+
     # 4. Detailed Evaluation
     print("Menghitung Detail Metrik...")
     X_test_tfidf = vectorizer.transform(X_test)
     y_pred = model.predict(X_test_tfidf)
-    
+
     accuracy = accuracy_score(y_test, y_pred)
     report = classification_report(y_test, y_pred, zero_division=0)
-    
+
     print("\n" + "="*50)
     print(f"HASIL EVALUASI MODEL - Skincare Chatbot")
     print("="*50)
@@ -56,5 +70,153 @@ def evaluate():
     print(report)
     print("="*50)
 
+# --- Grouped k-fold cross-validation + hyperparameter sweep ---
+# Semua varian augmentasi dari satu pola sumber berada di fold yang sama,
+# sehingga varian "kembar" tidak bocor dari data latih ke data uji.
+
+def _init_cv_worker(X, y, folds, C_values, latency_samples):
+    global _X, _y, _folds, _C_values, _latency_samples
+    _X, _y, _folds, _C_values, _latency_samples = X, y, folds, C_values, latency_samples
+
+def _run_fold(task):
+    fold, ngram_range, max_features = task
+    train_idx, test_idx = _folds[fold]
+
+    # Vectorizer di-fit sekali per fold dan dipakai ulang untuk setiap nilai C
+    start = time.perf_counter()
+    vectorizer = make_vectorizer(ngram_range=ngram_range, max_features=max_features)
+    X_train = vectorizer.fit_transform(_X[train_idx])
+    X_test = vectorizer.transform(_X[test_idx])
+    vectorize_s = time.perf_counter() - start
+    vectorizer_bytes = len(pickle.dumps(vectorizer))
+    samples = _X[test_idx][:_latency_samples]
+
+    results = []
+    for C in _C_values:
+        start = time.perf_counter()
+        model = make_model(C=C)
+        model.fit(X_train, _y[train_idx])
+        fit_s = time.perf_counter() - start
+        accuracy = accuracy_score(_y[test_idx], model.predict(X_test))
+
+        start = time.perf_counter()
+        for text in samples:
+            model.predict_proba(vectorizer.transform([text]))
+        latency_us = (time.perf_counter() - start) * 1e6 / max(len(samples), 1)
+
+        results.append({
+            "fold": fold,
+            "ngram_range": list(ngram_range),
+            "max_features": max_features,
+            "C": C,
+            "accuracy": accuracy,
+            "latency_us": latency_us,
+            "size_bytes": vectorizer_bytes + len(pickle.dumps(model)),
+            "fit_s": vectorize_s + fit_s,
+        })
+    return results
+
+def grouped_folds(labels, groups, n_folds, seed=42):
+    splitter = StratifiedGroupKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    return list(splitter.split(np.zeros(len(labels)), labels, groups))
+
+def summarize(fold_results):
+    configs = {}
+    for result in fold_results:
+        key = (tuple(result["ngram_range"]), result["max_features"], result["C"])
+        configs.setdefault(key, []).append(result)
+
+    summary = []
+    for (ngram_range, max_features, C), results in configs.items():
+        accuracies = [r["accuracy"] for r in results]
+        summary.append({
+            "ngram_range": list(ngram_range),
+            "max_features": max_features,
+            "C": C,
+            "accuracy_mean": statistics.mean(accuracies),
+            "accuracy_std": statistics.pstdev(accuracies),
+            "latency_us": statistics.median(r["latency_us"] for r in results),
+            "size_kb": statistics.mean(r["size_bytes"] for r in results) / 1024,
+            "fit_s": statistics.mean(r["fit_s"] for r in results),
+        })
+    summary.sort(key=lambda r: (-r["accuracy_mean"], r["latency_us"]))
+    return summary
+
+def recommend(summary, tolerance):
+    best = summary[0]["accuracy_mean"]
+    eligible = [r for r in summary if r["accuracy_mean"] >= best - tolerance]
+    return min(eligible, key=lambda r: r["latency_us"])
+
+def cross_validate(ngram_ranges, max_features_values, C_values, n_folds=5, workers=1, latency_samples=200):
+    print("Loading Dataset & Performing Augmentation...")
+    patterns, labels, groups, _ = build_training_rows(DATASET_PATH, augment=True, workers=workers)
+    X = np.array(patterns, dtype=object)
+    y = np.array(labels)
+    folds = grouped_folds(labels, groups, n_folds)
+    print(f"Total Data setelah Augmentasi: {len(patterns)} dari {len(set(groups))} pola sumber, {n_folds} fold")
+
+    tasks = list(product(range(n_folds), ngram_ranges, max_features_values))
+    print(f"Menjalankan {len(tasks)} fit vectorizer x {len(C_values)} nilai C dengan {workers} worker...")
+    initargs = (X, y, folds, C_values, latency_samples)
+    if workers <= 1:
+        _init_cv_worker(*initargs)
+        fold_results = [r for task in tasks for r in _run_fold(task)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_cv_worker, initargs=initargs) as executor:
+            fold_results = [r for results in executor.map(_run_fold, tasks) for r in results]
+    return fold_results
+
+def _parse_ngram(value):
+    low, high = value.split(',')
+    return int(low), int(high)
+
+def _parse_max_features(value):
+    return None if value.lower() == 'none' else int(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluasi model dengan grouped k-fold dan sweep hyperparameter")
+    parser.add_argument('--holdout', action='store_true',
+                        help="jalankan evaluasi lama (satu split 80/20 tanpa pengelompokan)")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--ngram-range', type=_parse_ngram, nargs='+', default=[(1, 3), (1, 4), (2, 5)],
+                        help="rentang n-gram karakter, mis. 1,4")
+    parser.add_argument('--max-features', type=_parse_max_features, nargs='+', default=[1000, 3000, 10000],
+                        help="jumlah fitur maksimum, 'none' untuk tanpa batas")
+    parser.add_argument('--C', type=float, nargs='+', default=[1.0, 10.0])
+    parser.add_argument('--latency-samples', type=int, default=200)
+    parser.add_argument('--tolerance', type=float, default=0.01,
+                        help="selisih akurasi dari konfigurasi terbaik yang masih diterima saat memilih model tercepat")
+    parser.add_argument('--output', help="simpan hasil per fold dan ringkasan sebagai JSON")
+    args = parser.parse_args()
+
+    if args.holdout:
+        evaluate()
+        return
+
+    print("Mulai Evaluasi Model Skincare Chatbot (grouped k-fold)...")
+    start = time.perf_counter()
+    fold_results = cross_validate(args.ngram_range, args.max_features, args.C,
+                                  args.folds, args.workers, args.latency_samples)
+    summary = summarize(fold_results)
+    choice = recommend(summary, args.tolerance)
+
+    print("\n" + "="*50)
+    print(f"HASIL CROSS-VALIDATION - Skincare Chatbot ({time.perf_counter() - start:.1f} s)")
+    print("="*50)
+    print(f"{'ngram':>7} {'fitur':>7} {'C':>6} {'akurasi':>15} {'us/pesan':>9} {'ukuran KB':>10}")
+    for r in summary:
+        ngram = f"{r['ngram_range'][0]}-{r['ngram_range'][1]}"
+        print(f"{ngram:>7} {str(r['max_features']):>7} {r['C']:>6g} "
+              f"{r['accuracy_mean']*100:7.2f} ± {r['accuracy_std']*100:4.2f} {r['latency_us']:9.1f} {r['size_kb']:10.1f}")
+    print(f"\nRekomendasi (tercepat dengan akurasi dalam {args.tolerance*100:.1f} poin dari terbaik): "
+          f"ngram_range={tuple(choice['ngram_range'])}, max_features={choice['max_features']}, C={choice['C']:g}")
+    print("="*50)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"folds": fold_results, "ringkasan": summary, "rekomendasi": choice}, f, indent=2)
+        print(f"Hasil disimpan di {args.output}")
+
 if __name__ == "__main__":
-    evaluate()
+    main()
@@ -0,0 +1,104 @@
+"""Pencocokan fuzzy berindeks atas pola dataset; sama dengan scan linear bila pola terbaik masuk TOP_K kandidat."""
+from difflib import SequenceMatcher
+
+import numpy as np
+
+NGRAM_SIZE = 2
+TOP_K = 64
+
+
+def char_ngrams(text, n=NGRAM_SIZE):
+    padded = f' {text} '
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _build_postings(feature_sets):
+    feature_ids = {}
+    postings = []
+    for pattern_id, features in enumerate(feature_sets):
+        for feature in features:
+            feature_id = feature_ids.setdefault(feature, len(postings))
+            if feature_id == len(postings):
+                postings.append([])
+            postings[feature_id].append(pattern_id)
+    return feature_ids, [np.array(ids, dtype=np.int32) for ids in postings]
+
+
+class PatternIndex:
+    def __init__(self, patterns, top_k=TOP_K):
+        self.patterns = list(dict.fromkeys(patterns))
+        self.top_k = top_k
+        self.lengths = np.array([len(p) for p in self.patterns], dtype=np.int64)
+
+        ngram_sets = [char_ngrams(p) for p in self.patterns]
+        self.ngram_counts = np.array([len(s) for s in ngram_sets], dtype=np.int64)
+        self._ngram_ids, self._ngram_postings = _build_postings(ngram_sets)
+
+        token_sets = [set(p.split()) for p in self.patterns]
+        self.token_counts = np.array([len(s) for s in token_sets], dtype=np.int64)
+        self._token_ids, self._token_postings = _build_postings(token_sets)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _overlap(self, features, feature_ids, postings):
+        hits = [postings[feature_ids[f]] for f in features if f in feature_ids]
+        if not hits:
+            return None
+        return np.bincount(np.concatenate(hits), minlength=len(self.patterns))
+
+    def ratio_candidates(self, text, threshold=0.6, allowed=None):
+        ngrams = char_ngrams(text)
+        overlap = self._overlap(ngrams, self._ngram_ids, self._ngram_postings)
+        if overlap is None:
+            return []
+
+        total_length = self.lengths + len(text)
+        max_ratio = 2.0 * np.minimum(self.lengths, len(text)) / np.maximum(total_length, 1)
+        mask = (overlap > 0) & (max_ratio >= threshold)
+        if allowed is not None:
+            mask &= allowed
+        candidates = np.flatnonzero(mask)
+
+        if len(candidates) > self.top_k:
+            dice = 2.0 * overlap[candidates] / (self.ngram_counts[candidates] + len(ngrams))
+            best = np.argpartition(-dice, self.top_k - 1)[:self.top_k]
+            candidates = np.sort(candidates[best])
+        return candidates.tolist()
+
+    def best_ratio_match(self, text, threshold=0.6, allowed=None):
+        best_match = None
+        best_score = 0
+        matcher = SequenceMatcher(None, text)
+
+        for pattern_id in self.ratio_candidates(text, threshold, allowed):
+            matcher.set_seq2(self.patterns[pattern_id])
+            floor = max(best_score, threshold)
+            if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+                continue
+            score = matcher.ratio()
+            if score > best_score and score >= threshold:
+                best_score = score
+                best_match = self.patterns[pattern_id]
+
+        return best_match, best_score
+
+    def best_jaccard_match(self, text, threshold=0.4, allowed=None):
+        tokens = set(text.split())
+        if not tokens:
+            return None, 0
+
+        overlap = self._overlap(tokens, self._token_ids, self._token_postings)
+        if overlap is None:
+            return None, 0
+
+        union = self.token_counts + len(tokens) - overlap
+        jaccard = np.where(union > 0, overlap / np.maximum(union, 1), 0.0)
+        if allowed is not None:
+            jaccard = np.where(allowed, jaccard, 0.0)
+
+        pattern_id = int(jaccard.argmax())
+        score = float(jaccard[pattern_id])
+        if score <= 0 or score < threshold:
+            return None, 0
+        return self.patterns[pattern_id], score
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+MODES = ("inline", "thread", "process")
+
+_worker_engine = None
+
+
+def _init_worker(engine_kwargs):
+    global _worker_engine
+    from chatbot_engine import ChatbotEngine
+    _worker_engine = ChatbotEngine(**engine_kwargs)
+
+
+def _call_worker(method, args):
+    return getattr(_worker_engine, method)(*args)
+
+
+def _warm_worker(queries):
+    for query in queries:
+        _worker_engine.get_response(query)
+
+
+class PoolFull(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Antrean inferensi penuh")
+        self.retry_after = retry_after
+
+
+class InferenceTimeout(Exception):
+    pass
+
+
+class InferencePool:
+    def __init__(self, engine, mode="thread", max_workers=4, max_queue=64,
+                 timeout=10.0, retry_after=1, engine_kwargs=None, canary_queries=()):
+        if mode not in MODES:
+            raise ValueError(f"Mode pool tidak dikenal: {mode}")
+        self.engine = engine
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.engine_kwargs = engine_kwargs or {}
+        self.canary_queries = list(canary_queries)
+
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+        self._executor = None
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inferensi")
+        elif mode == "process":
+            self._executor = self._create_process_executor()
+
+    def _create_process_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.engine_kwargs,),
+        )
+
+    def _warm_executor(self, executor):
+        # Satu tugas per worker: semua proses dimulai (initializer memuat engine) sebelum melayani permintaan
+        futures = [executor.submit(_warm_worker, self.canary_queries) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def swap_engine(self, engine):
+        if self.mode == "process":
+            # Mode process tidak memakai engine induk; worker baru dimuat dan diuji kanari sebelum menggantikan yang lama
+            executor = self._create_process_executor()
+            try:
+                self._warm_executor(executor)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            old_executor, self._executor = self._executor, executor
+            self.engine = engine
+            old_executor.shutdown(wait=False)
+            return
+        self.engine = engine
+
+    def _submit(self, method, args, engine):
+        if self.mode == "thread":
+            return self._executor.submit(getattr(engine or self.engine, method), *args)
+        executor = self._executor
+        try:
+            return executor.submit(_call_worker, method, args)
+        except RuntimeError:
+            # Executor lama baru saja ditutup oleh swap_engine; kirim ke penggantinya
+            if executor is self._executor:
+                raise
+            return self._executor.submit(_call_worker, method, args)
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+            if not future.cancelled() and future.exception() is None:
+                self.completed += 1
+
+    async def run(self, method, *args, engine=None):
+        # engine: jalankan pada engine lain (mis. milik tenant) alih-alih engine utama pool
+        if engine is not None and self.mode == "process":
+            raise ValueError("Mode pool process tidak mendukung engine per permintaan")
+        if self.mode == "inline":
+            result = getattr(engine or self.engine, method)(*args)
+            self.completed += 1
+            return result
+
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolFull(self.retry_after)
+            self.pending += 1
+
+        try:
+            future = self._submit(method, args, engine)
+        except BaseException:
+            # Gagal sebelum masuk executor (engine/metode tidak ada, executor sudah ditutup): kembalikan slotnya
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise InferenceTimeout(f"Inferensi melebihi batas waktu {self.timeout} detik")
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,26 @@
-from fastapi import FastAPI, HTTPException
+import json
+import os
+import threading
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
-from chatbot_engine import ChatbotEngine
+# chatbot_engine (numpy, sklearn lewat pickle, Sastrawi) sengaja tidak diimpor di sini;
+# modul itu baru dimuat saat engine dibuat, lihat buat_engine()
+from batcher import MicroBatcher
+from chat_log import ChatLogger
+from engine_manager import KUERI_KANARI, EngineManager
+from inference_pool import InferencePool, InferenceTimeout, PoolFull
+from metrics import EngineMetrics
+from session_store import InMemorySessionStore, create_session_store
+from tenant_registry import TenantNotFound, TenantRegistry
+
+WAKTU_MULAI = time.perf_counter()
 
 app = FastAPI(
     title="Beauty Paw Chatbot API",
@@ -18,19 +36,143 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-try:
-    chatbot = ChatbotEngine(model_dir="models", dataset_path="datasets.json")
-    print("Chatbot berhasil diinisialisasi")
-except Exception as e:
-    print(f"Gagal menginisialisasi chatbot: {e}")
-    chatbot = None
+UKURAN_CACHE_KALIMAT = int(os.environ.get("CHATBOT_CACHE_SIZE", "0"))
+UKURAN_CACHE_STEM = int(os.environ.get("CHATBOT_STEM_CACHE_SIZE", "0"))
+MODE_POOL = os.environ.get("CHATBOT_POOL_MODE", "thread")
+JUMLAH_WORKER = int(os.environ.get("CHATBOT_POOL_WORKERS", str(os.cpu_count() or 1)))
+UKURAN_ANTREAN = int(os.environ.get("CHATBOT_POOL_QUEUE", "64"))
+BATAS_WAKTU = float(os.environ.get("CHATBOT_TIMEOUT", "10"))
+UKURAN_BATCH_MAKS = int(os.environ.get("CHATBOT_BATCH_MAX_SIZE", "1"))
+TUNGGU_BATCH_MS = float(os.environ.get("CHATBOT_BATCH_MAX_WAIT_MS", "5"))
+BACKEND_MODEL = os.environ.get("CHATBOT_BACKEND", "sklearn")
+INTERVAL_MUAT_ULANG = float(os.environ.get("CHATBOT_RELOAD_INTERVAL", "0"))
+TOKEN_ADMIN = os.environ.get("CHATBOT_ADMIN_TOKEN", "")
+METRIK_AKTIF = os.environ.get("CHATBOT_METRICS", "0") == "1"
+KATA_PER_POTONGAN = int(os.environ.get("CHATBOT_STREAM_CHUNK_WORDS", "8"))
+BACKEND_SESI = os.environ.get("CHATBOT_SESSION_BACKEND", "memory")
+# Mode mulai cepat: server langsung menerima koneksi, engine dimuat di thread latar
+MULAI_CEPAT = os.environ.get("CHATBOT_FAST_START", "0") == "1"
+# Multi-tenant: setiap toko punya <CHATBOT_TENANT_DIR>/<tenant_id>/{datasets.json,models/}
+DIREKTORI_TENANT = os.environ.get("CHATBOT_TENANT_DIR", "")
+ANGGARAN_MEMORI_TENANT_MB = float(os.environ.get("CHATBOT_TENANT_MEMORY_MB", "512"))
+# Log pesan/intent untuk dilatih ulang; kosong = nonaktif
+DIREKTORI_LOG_CHAT = os.environ.get("CHATBOT_CHAT_LOG_DIR", "")
+
+KONFIGURASI_ENGINE = {
+    "model_dir": os.environ.get("CHATBOT_MODEL_DIR", "models"),
+    "dataset_path": os.environ.get("CHATBOT_DATASET", "datasets.json"),
+    "cache_size": UKURAN_CACHE_KALIMAT,
+    "stem_cache_size": UKURAN_CACHE_STEM,
+    "backend": BACKEND_MODEL,
+    "compact": os.environ.get("CHATBOT_COMPACT", "0") == "1",
+    # Seed RNG pemilihan respons; kosong = acak per proses
+    "seed": int(os.environ["CHATBOT_SEED"]) if os.environ.get("CHATBOT_SEED") else None,
+}
+
+pool = InferencePool(
+    None,
+    mode=MODE_POOL,
+    max_workers=JUMLAH_WORKER,
+    max_queue=UKURAN_ANTREAN,
+    timeout=BATAS_WAKTU,
+    engine_kwargs=KONFIGURASI_ENGINE,
+    canary_queries=KUERI_KANARI,
+)
+
+if METRIK_AKTIF and MODE_POOL == "process":
+    # Engine di proses worker tidak berbagi EngineMetrics dengan proses ini; /metrics hanya akan berisi nol
+    raise ValueError("CHATBOT_METRICS membutuhkan CHATBOT_POOL_MODE thread atau inline")
+metrics = EngineMetrics() if METRIK_AKTIF else None
+
+_cache_bersama = None
+_kunci_cache_bersama = threading.Lock()
+
+def cache_preprocessing_bersama():
+    # Satu cache preprocessing untuk engine utama dan semua tenant; hasilnya tidak bergantung model
+    global _cache_bersama
+    if UKURAN_CACHE_KALIMAT <= 0 and UKURAN_CACHE_STEM <= 0:
+        return None
+    with _kunci_cache_bersama:
+        if _cache_bersama is None:
+            from chatbot_engine import preprocess_fingerprint
+            from text_cache import PreprocessCache
+            _cache_bersama = PreprocessCache(
+                sentence_size=UKURAN_CACHE_KALIMAT,
+                stem_size=UKURAN_CACHE_STEM,
+                fingerprint=preprocess_fingerprint(),
+            )
+            _cache_bersama.load(f'{KONFIGURASI_ENGINE["model_dir"]}/preprocess_cache.json')
+        return _cache_bersama
+
+def buat_engine(model_dir=KONFIGURASI_ENGINE["model_dir"], dataset_path=KONFIGURASI_ENGINE["dataset_path"]):
+    from chatbot_engine import ChatbotEngine
+    return ChatbotEngine(
+        **dict(KONFIGURASI_ENGINE, model_dir=model_dir, dataset_path=dataset_path),
+        metrics=metrics,
+        preprocess_cache=cache_preprocessing_bersama(),
+    )
+
+manager = EngineManager(buat_engine, KONFIGURASI_ENGINE["model_dir"])
+manager.add_listener(pool.swap_engine)
+
+registry = None
+if DIREKTORI_TENANT:
+    if MODE_POOL == "process":
+        raise ValueError("CHATBOT_TENANT_DIR membutuhkan CHATBOT_POOL_MODE thread atau inline")
+    registry = TenantRegistry(DIREKTORI_TENANT, buat_engine, int(ANGGARAN_MEMORI_TENANT_MB * 2**20))
+
+siap_dalam_detik = None
+
+def muat_engine():
+    global siap_dalam_detik
+    try:
+        manager.reload()
+        siap_dalam_detik = time.perf_counter() - WAKTU_MULAI
+        print(f"Chatbot berhasil diinisialisasi ({siap_dalam_detik:.2f} s)")
+    except Exception as e:
+        print(f"Gagal menginisialisasi chatbot: {e}")
+
+if not MULAI_CEPAT:
+    muat_engine()
+
+sessions = create_session_store(
+    BACKEND_SESI,
+    ttl=float(os.environ.get("CHATBOT_SESSION_TTL", "1800")),
+    max_sessions=int(os.environ.get("CHATBOT_SESSION_MAX", "100000")),
+    history=int(os.environ.get("CHATBOT_SESSION_HISTORY", "3")),
+    path=os.environ.get("CHATBOT_SESSION_DB", "sessions.db"),
+)
+
+chat_log = None
+if DIREKTORI_LOG_CHAT:
+    chat_log = ChatLogger(
+        DIREKTORI_LOG_CHAT,
+        fmt=os.environ.get("CHATBOT_CHAT_LOG_FORMAT", "jsonl"),
+        capacity=int(os.environ.get("CHATBOT_CHAT_LOG_BUFFER", "10000")),
+        batch_size=int(os.environ.get("CHATBOT_CHAT_LOG_BATCH", "500")),
+        # Ukuran sebelum kompresi; umur segmen menentukan seberapa cepat log bisa dibaca
+        rotate_bytes=int(float(os.environ.get("CHATBOT_CHAT_LOG_ROTATE_MB", "64")) * 2**20),
+        rotate_seconds=float(os.environ.get("CHATBOT_CHAT_LOG_ROTATE_SECONDS", "60")),
+    )
+
+batcher = None
+if UKURAN_BATCH_MAKS > 1:
+    batcher = MicroBatcher(
+        lambda messages: pool.run("get_responses", messages),
+        max_batch_size=UKURAN_BATCH_MAKS,
+        max_wait_ms=TUNGGU_BATCH_MS,
+    )
 
 class PermintaanChat(BaseModel):
     message: str
+    session_id: Optional[str] = None
+    tenant_id: Optional[str] = None
     class Config:
         json_schema_extra = {
             "example": {
-                "message": "Halo, apa itu serum?"
+                "message": "Halo, apa itu serum?",
+                "session_id": "pengguna-123",
+                "tenant_id": "toko-bandung"
             }
         }
 
@@ -49,6 +191,164 @@ class ResponChat(BaseModel):
             }
         }
 
+class PermintaanChatBatch(BaseModel):
+    messages: List[str]
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "messages": ["Halo", "Apa itu serum?", "Cara pemesanan"]
+            }
+        }
+
+class ResponChatBatch(BaseModel):
+    total: int
+    hasil: List[ResponChat]
+
+class PermintaanTopIntent(BaseModel):
+    message: str
+    k: int = 5
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "message": "Apa itu serum?",
+                "k": 3
+            }
+        }
+
+class KandidatIntent(BaseModel):
+    intent: str
+    skor: float
+
+class ResponTopIntent(BaseModel):
+    pesan_pengguna: str
+    kandidat: List[KandidatIntent]
+
+MAKS_PESAN_BATCH = 1000
+MAKS_TOP_K = 20
+
+def muat_engine_latar():
+    muat_engine()
+    # Pengawas baru dimulai setelah muat awal supaya tidak ikut memuat model yang sama
+    manager.start_watcher(INTERVAL_MUAT_ULANG)
+
+@app.on_event("startup")
+def mulai_pengawas_model():
+    if MULAI_CEPAT:
+        threading.Thread(target=muat_engine_latar, name="muat-engine", daemon=True).start()
+    else:
+        manager.start_watcher(INTERVAL_MUAT_ULANG)
+
+@app.on_event("shutdown")
+async def simpan_cache():
+    manager.stop_watcher()
+    if batcher is not None:
+        await batcher.shutdown()
+    pool.shutdown()
+    sessions.close()
+    if chat_log is not None:
+        chat_log.close()
+    if _cache_bersama is not None:
+        path = f'{KONFIGURASI_ENGINE["model_dir"]}/preprocess_cache.json'
+        _cache_bersama.save(path)
+        print(f"Cache preprocessing disimpan di {path}")
+
+async def jalankan_inferensi(proses):
+    try:
+        return await proses
+    except PoolFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Server sedang sibuk, silakan coba lagi sebentar lagi",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except InferenceTimeout as e:
+        raise HTTPException(
+            status_code=504,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Terjadi kesalahan saat memproses pesan: {str(e)}"
+        )
+
+async def akses_sesi(fungsi, *args):
+    # Store memori cukup cepat untuk event loop; SQLite dijalankan di threadpool
+    if isinstance(sessions, InMemorySessionStore):
+        return fungsi(*args)
+    return await run_in_threadpool(fungsi, *args)
+
+async def engine_tenant(tenant_id):
+    if registry is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Multi-tenant dinonaktifkan. Atur CHATBOT_TENANT_DIR untuk mengaktifkan."
+        )
+    try:
+        # Tenant yang belum dimuat butuh waktu membaca model; jangan tahan event loop
+        return await run_in_threadpool(registry.get, tenant_id)
+    except TenantNotFound:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Tenant tidak dikenal: {tenant_id}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Gagal memuat model tenant {tenant_id}: {str(e)}"
+        )
+
+def kunci_sesi(session_id, tenant_id=None):
+    # "<tenant>:<sesi>", dengan tenant kosong untuk engine utama. ID tenant tidak boleh memuat ":",
+    # jadi ID sesi apa pun (mis. "a:s") tidak bisa jatuh ke kunci sesi tenant lain.
+    return f"{tenant_id or ''}:{session_id}"
+
+async def dapatkan_respon(message, session_id=None, tenant_id=None):
+    result = await prediksi_respon(message, session_id, tenant_id)
+    if chat_log is not None:
+        chat_log.log(message, result["intent"], result["confidence"], result["fallback"], tenant_id or None)
+    return result
+
+async def prediksi_respon(message, session_id=None, tenant_id=None):
+    engine = None
+    if tenant_id:
+        engine = await engine_tenant(tenant_id)
+    if session_id:
+        kunci = kunci_sesi(session_id, tenant_id)
+        riwayat = await akses_sesi(sessions.get, kunci)
+        result = await jalankan_inferensi(
+            pool.run("get_response_with_context", message, riwayat, f"{kunci}:{message}", engine=engine)
+        )
+        await akses_sesi(sessions.record, kunci, result["intent"])
+        return result
+    if batcher is not None and engine is None:
+        return await jalankan_inferensi(batcher.submit(message))
+    return await jalankan_inferensi(pool.run("get_response", message, engine=engine))
+
+def encode_respon_chat(message, result):
+    # Setara ResponChat yang diserialisasi FastAPI, tetapi teks respons sudah di-encode engine saat model dimuat
+    return b''.join((
+        b'{"pesan_pengguna":', json.dumps(message, ensure_ascii=False).encode('utf-8'),
+        b',"respon_bot":', result["response_json"],
+        b',"intent":', json.dumps(result["intent"], ensure_ascii=False).encode('utf-8'),
+        b',"kepercayaan":', repr(float(result["confidence"])).encode('ascii'),
+        b'}',
+    ))
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def kirim_stream(message, result):
+    from chatbot_engine import iter_response_chunks
+    yield format_sse("intent", {
+        "pesan_pengguna": message,
+        "intent": result["intent"],
+        "kepercayaan": result["confidence"]
+    })
+    for potongan in iter_response_chunks(result["response"], KATA_PER_POTONGAN):
+        yield format_sse("potongan", {"teks": potongan})
+    yield format_sse("selesai", {})
+
 @app.get("/")
 async def beranda():
     return {
@@ -56,6 +356,16 @@ async def beranda():
         "layanan": "Beauty Paw Chatbot API",
         "endpoint": {
             "chat": "/chat (POST)",
+            "chat_stream": "/chat/stream (POST, Server-Sent Events)",
+            "chat_batch": "/chat/batch (POST)",
+            "top_intent": "/intent/top (POST)",
+            "hapus_sesi": "/session/{session_id}?tenant_id= (DELETE)",
+            "tenant": "/tenants",
+            "status": "/status",
+            "kesehatan": "/health",
+            "kesiapan": "/ready",
+            "metrik": "/metrics",
+            "muat_ulang_model": "/admin/reload (POST)",
             "dokumentasi": "/docs",
             "redoc": "/redoc"
         }
@@ -63,7 +373,7 @@ async def beranda():
 
 @app.post("/chat", response_model=ResponChat)
 async def chat(request: PermintaanChat):
-    if chatbot is None:
+    if not request.tenant_id and manager.engine is None:
         raise HTTPException(
             status_code=503,
             detail="Layanan chatbot tidak tersedia. Pastikan model sudah dilatih."
@@ -75,14 +385,75 @@ async def chat(request: PermintaanChat):
             detail="Pesan tidak boleh kosong"
         )
 
+    result = await dapatkan_respon(request.message, request.session_id, request.tenant_id)
+
     try:
-        result = chatbot.get_response(request.message)
+        return Response(content=encode_respon_chat(request.message, result), media_type="application/json")
 
-        return ResponChat(
-            pesan_pengguna=request.message,
-            respon_bot=result["response"],
-            intent=result["intent"],
-            kepercayaan=result["confidence"]
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Terjadi kesalahan saat memproses pesan: {str(e)}"
+        )
+
+@app.post("/chat/stream")
+async def chat_stream(request: PermintaanChat):
+    if not request.tenant_id and manager.engine is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Layanan chatbot tidak tersedia. Pastikan model sudah dilatih."
+        )
+
+    if not request.message or request.message.strip() == "":
+        raise HTTPException(
+            status_code=400,
+            detail="Pesan tidak boleh kosong"
+        )
+
+    result = await dapatkan_respon(request.message, request.session_id, request.tenant_id)
+    return StreamingResponse(
+        kirim_stream(request.message, result),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/chat/batch", response_model=ResponChatBatch)
+async def chat_batch(request: PermintaanChatBatch):
+    if manager.engine is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Layanan chatbot tidak tersedia. Pastikan model sudah dilatih."
+        )
+
+    if not request.messages:
+        raise HTTPException(
+            status_code=400,
+            detail="Daftar pesan tidak boleh kosong"
+        )
+
+    if len(request.messages) > MAKS_PESAN_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maksimal {MAKS_PESAN_BATCH} pesan per permintaan"
+        )
+
+    for index, message in enumerate(request.messages):
+        if not message or message.strip() == "":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Pesan ke-{index} tidak boleh kosong"
+            )
+
+    results = await jalankan_inferensi(pool.run("get_responses", request.messages))
+    if chat_log is not None:
+        for message, result in zip(request.messages, results):
+            chat_log.log(message, result["intent"], result["confidence"], result["fallback"])
+
+    try:
+        hasil = b','.join(encode_respon_chat(message, result) for message, result in zip(request.messages, results))
+        return Response(
+            content=b'{"total":%d,"hasil":[%b]}' % (len(results), hasil),
+            media_type="application/json"
         )
 
     except Exception as e:
@@ -93,14 +464,156 @@ async def chat(request: PermintaanChat):
 
 @app.get("/intent")
 async def daftar_intent():
-    if chatbot is None:
+    if manager.engine is None:
         raise HTTPException(
             status_code=503,
             detail="Layanan chatbot tidak tersedia"
         )
+    chatbot = manager.engine
     return {
+        "versi_model": manager.version,
         "total_intent": len(chatbot.intent_responses),
-        "daftar_intent": list(chatbot.intent_responses.keys())
+        "daftar_intent": list(chatbot.intent_responses.keys()),
+        "cache_preprocessing": chatbot.cache_stats()
+    }
+
+@app.post("/intent/top", response_model=ResponTopIntent)
+async def top_intent(request: PermintaanTopIntent):
+    if manager.engine is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Layanan chatbot tidak tersedia"
+        )
+
+    if not request.message or request.message.strip() == "":
+        raise HTTPException(
+            status_code=400,
+            detail="Pesan tidak boleh kosong"
+        )
+
+    if not 1 <= request.k <= MAKS_TOP_K:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Nilai k harus antara 1 dan {MAKS_TOP_K}"
+        )
+
+    kandidat = await jalankan_inferensi(pool.run("top_intents", request.message, request.k))
+    return ResponTopIntent(
+        pesan_pengguna=request.message,
+        kandidat=[KandidatIntent(intent=intent, skor=skor) for intent, skor in kandidat]
+    )
+
+@app.get("/health")
+async def kesehatan():
+    return {"status": "hidup"}
+
+@app.get("/ready")
+async def kesiapan():
+    if manager.engine is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "status": "gagal" if manager.last_error else "memuat",
+                "error_terakhir": manager.last_error
+            },
+            headers={"Retry-After": "1"}
+        )
+    return {
+        "status": "siap",
+        "versi_model": manager.version,
+        "siap_dalam_detik": siap_dalam_detik
+    }
+
+@app.get("/status")
+async def status_layanan():
+    if manager.engine is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Layanan chatbot tidak tersedia"
+        )
+    from chatbot_engine import stem_table
+    return {
+        "status": "aktif",
+        "mulai_cepat": MULAI_CEPAT,
+        "siap_dalam_detik": siap_dalam_detik,
+        "model": manager.status(),
+        "pool_inferensi": pool.stats(),
+        "micro_batching": batcher.stats() if batcher is not None else None,
+        "sesi": sessions.stats(),
+        "log_chat": chat_log.stats() if chat_log is not None else None,
+        "tenant": registry.stats() if registry is not None else None,
+        "tabel_stem": stem_table.stats(),
+        "metrik": metrics.snapshot() if metrics is not None else None
+    }
+
+@app.get("/tenants")
+async def daftar_tenant():
+    if registry is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Multi-tenant dinonaktifkan. Atur CHATBOT_TENANT_DIR untuk mengaktifkan."
+        )
+    return {
+        "tersedia": await run_in_threadpool(registry.available),
+        "registry": registry.stats()
+    }
+
+@app.delete("/session/{session_id}")
+async def hapus_sesi(session_id: str, tenant_id: Optional[str] = None):
+    terhapus = await akses_sesi(sessions.clear, kunci_sesi(session_id, tenant_id))
+    return {
+        "session_id": session_id,
+        "tenant_id": tenant_id,
+        "dihapus": terhapus
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrik():
+    if metrics is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Metrik dinonaktifkan. Atur CHATBOT_METRICS=1 untuk mengaktifkan."
+        )
+    pool_stats = pool.stats()
+    gauges = {
+        "pool_pending": pool_stats["pending"],
+        "model_generation": manager.generation,
+    }
+    counters = {
+        "pool_completed_total": pool_stats["completed"],
+        "pool_rejected_total": pool_stats["rejected"],
+        "pool_timeouts_total": pool_stats["timeouts"],
+    }
+    if chat_log is not None:
+        log_stats = chat_log.stats()
+        gauges["chat_log_buffered"] = log_stats["buffered"]
+        counters["chat_log_written_total"] = log_stats["written"]
+        counters["chat_log_dropped_total"] = log_stats["dropped"]
+    return PlainTextResponse(metrics.render(gauges, counters), media_type="text/plain; version=0.0.4")
+
+@app.post("/admin/reload")
+async def muat_ulang_model(x_admin_token: str = Header(default="")):
+    if not TOKEN_ADMIN:
+        raise HTTPException(
+            status_code=403,
+            detail="Endpoint admin dinonaktifkan. Atur CHATBOT_ADMIN_TOKEN untuk mengaktifkan."
+        )
+    if x_admin_token != TOKEN_ADMIN:
+        raise HTTPException(
+            status_code=401,
+            detail="Token admin tidak valid"
+        )
+
+    try:
+        await run_in_threadpool(manager.reload)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Gagal memuat ulang model, model lama tetap dipakai: {str(e)}"
+        )
+    return {
+        "status": "berhasil",
+        "model": manager.status()
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+# Batas bucket histogram dalam detik, dari 50 mikrodetik sampai 1 detik.
+BUCKET_DETIK = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+TAHAPAN = ("normalize", "stem", "vectorize", "predict_proba", "fallback")
+
+# Tahap kaskade yang menjawab sebuah pesan; "fuzzy" dan "unknown" berarti fallback berjalan.
+TAHAPAN_KASKADE = ("hot", "exact", "model", "fuzzy", "unknown")
+
+PREFIX = "chatbot"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKET_DETIK):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            yield bound, running
+
+
+class EngineMetrics:
+    def __init__(self, buckets=BUCKET_DETIK):
+        self.buckets = buckets
+        self.stages = {stage: Histogram(buckets) for stage in TAHAPAN}
+        self.requests = 0
+        self.fallbacks = 0
+        self.unknown = 0
+        self.cascade = {stage: 0 for stage in TAHAPAN_KASKADE}
+        self.intents = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def record_prediction(self, intent, stage):
+        with self._lock:
+            self.requests += 1
+            self.cascade[stage] += 1
+            if stage in ("fuzzy", "unknown"):
+                self.fallbacks += 1
+            if intent == "unknown":
+                self.unknown += 1
+            self.intents[intent] += 1
+
+    def timer(self, stage):
+        return _StageTimer(self, stage)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "fallback_rate": self.fallbacks / self.requests if self.requests else 0.0,
+                "unknown_rate": self.unknown / self.requests if self.requests else 0.0,
+                "cascade_hit_rate": {
+                    stage: count / self.requests if self.requests else 0.0
+                    for stage, count in self.cascade.items()
+                },
+                "stages_ms": {
+                    stage: {
+                        "count": histogram.count,
+                        "avg": histogram.total / histogram.count * 1000 if histogram.count else 0.0,
+                    }
+                    for stage, histogram in self.stages.items()
+                },
+            }
+
+    def render(self, gauges=None, counters=None):
+        lines = []
+        with self._lock:
+            name = f"{PREFIX}_stage_duration_seconds"
+            lines.append(f"# HELP {name} Durasi tiap tahap preprocessing dan prediksi intent.")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, histogram in self.stages.items():
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{_format_value(bound)}"}} {count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {_format_value(histogram.total)}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+            for metric, help_text, value in (
+                ("requests_total", "Jumlah pesan yang diklasifikasikan.", self.requests),
+                ("fallback_total", "Jumlah pesan yang jatuh ke pencocokan fuzzy.", self.fallbacks),
+                ("unknown_total", "Jumlah pesan dengan intent unknown.", self.unknown),
+            ):
+                lines.append(f"# HELP {PREFIX}_{metric} {help_text}")
+                lines.append(f"# TYPE {PREFIX}_{metric} counter")
+                lines.append(f"{PREFIX}_{metric} {value}")
+
+            name = f"{PREFIX}_cascade_stage_total"
+            lines.append(f"# HELP {name} Jumlah pesan yang dijawab oleh tiap tahap kaskade.")
+            lines.append(f"# TYPE {name} counter")
+            for stage, count in self.cascade.items():
+                lines.append(f'{name}{{stage="{stage}"}} {count}')
+
+            name = f"{PREFIX}_intent_requests_total"
+            lines.append(f"# HELP {name} Jumlah pesan per intent hasil prediksi.")
+            lines.append(f"# TYPE {name} counter")
+            for intent, count in sorted(self.intents.items()):
+                lines.append(f'{name}{{intent="{_escape_label(intent)}"}} {count}')
+
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for metric, value in (values or {}).items():
+                if value is None:
+                    continue
+                lines.append(f"# TYPE {PREFIX}_{metric} {kind}")
+                lines.append(f"{PREFIX}_{metric} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+BUNDLE_VERSION = 1
+
+VECTORIZER_PARAMS = (
+    'analyzer', 'ngram_range', 'lowercase', 'binary', 'norm', 'use_idf',
+    'smooth_idf', 'sublinear_tf', 'strip_accents', 'max_df', 'min_df', 'max_features',
+)
+MODEL_PARAMS = ('C', 'class_weight', 'fit_intercept', 'max_iter', 'random_state', 'solver', 'tol')
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probability_mode(model):
+    if len(model.classes_) <= 2:
+        return 'binary'
+    if getattr(model, 'multi_class', 'auto') == 'ovr' or model.solver == 'liblinear':
+        return 'ovr'
+    return 'softmax'
+
+
+def prune_coefficients(coef, prune):
+    """Nolkan fraksi `prune` bobot dengan nilai absolut terkecil pada tiap kelas."""
+    coef = np.array(coef, dtype=np.float64)
+    if prune <= 0:
+        return coef
+    keep = coef.shape[1] - int(round(prune * coef.shape[1]))
+    if keep <= 0:
+        return np.zeros_like(coef)
+    threshold = -np.partition(-np.abs(coef), keep - 1, axis=1)[:, keep - 1:keep]
+    coef[np.abs(coef) < threshold] = 0.0
+    return coef
+
+
+def sparse_coefficients(coef, dtype='float32'):
+    """Ubah matriks bobot kelas x fitur menjadi CSR per fitur, opsional dikuantisasi int8 per kelas."""
+    by_feature = np.ascontiguousarray(coef.T)
+    features, classes = np.nonzero(by_feature)
+    indptr = np.zeros(by_feature.shape[0] + 1, dtype=np.int32)
+    np.cumsum(np.bincount(features, minlength=by_feature.shape[0]), out=indptr[1:])
+    data = by_feature[features, classes]
+
+    if dtype == 'int8':
+        scale = np.abs(coef).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        data = np.round(data / scale[classes]).astype(np.int8)
+    elif dtype == 'float32':
+        scale = None
+        data = data.astype(np.float32)
+    else:
+        raise ValueError(f"Tipe bobot tidak didukung: {dtype}")
+
+    class_dtype = np.uint8 if coef.shape[0] <= 256 else np.uint16
+    arrays = {"indptr": indptr, "classes": classes.astype(class_dtype), "data": data}
+    if scale is not None:
+        arrays["scale"] = scale.astype(np.float32)
+    return arrays
+
+
+def export_bundle(vectorizer, model, dataset_path, output_dir='models', name='bundle', compact=None):
+    from chatbot_engine import load_json_dataset, preprocess_fingerprint, preprocess_text
+
+    bundle_dir = f'{output_dir}/{name}'
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+
+    if compact is None:
+        np.save(f'{bundle_dir}/idf.npy', np.ascontiguousarray(vectorizer.idf_))
+        np.save(f'{bundle_dir}/coef.npy', np.ascontiguousarray(model.coef_))
+    else:
+        np.save(f'{bundle_dir}/idf.npy', np.asarray(vectorizer.idf_, dtype=np.float32))
+        pruned = prune_coefficients(model.coef_, compact.get('prune', 0.0))
+        for key, array in sparse_coefficients(pruned, compact.get('dtype', 'float32')).items():
+            np.save(f'{bundle_dir}/coef_{key}.npy', array)
+        compact = dict(compact, nnz=int(np.count_nonzero(pruned)), shape=list(pruned.shape))
+    np.save(f'{bundle_dir}/intercept.npy', np.ascontiguousarray(model.intercept_))
+    with open(f'{bundle_dir}/vocabulary.json', 'w', encoding='utf-8') as f:
+        json.dump(terms, f, ensure_ascii=False)
+
+    data = load_json_dataset(dataset_path)
+    patterns = []
+    intent_responses = {}
+    for intent in data['intents']:
+        intent_responses[intent['tag']] = intent['responses']
+        for pattern in intent['patterns']:
+            patterns.append([preprocess_text(pattern), intent['tag']])
+    with open(f'{bundle_dir}/patterns.json', 'w', encoding='utf-8') as f:
+        json.dump({"patterns": patterns, "intent_responses": intent_responses}, f, ensure_ascii=False)
+
+    vectorizer_params = vectorizer.get_params()
+    model_params = model.get_params()
+    model_path = f'{output_dir}/model.pkl'
+    meta = {
+        "version": BUNDLE_VERSION,
+        "vectorizer": {name: vectorizer_params[name] for name in VECTORIZER_PARAMS},
+        "model": {name: model_params[name] for name in MODEL_PARAMS},
+        "probability": probability_mode(model),
+        "classes": [str(c) for c in model.classes_],
+        "dataset_sha256": file_sha256(dataset_path),
+        "preprocess_fingerprint": preprocess_fingerprint(),
+        "model_sha256": file_sha256(model_path) if os.path.exists(model_path) else None,
+        "compact": compact,
+    }
+    with open(f'{bundle_dir}/meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return bundle_dir
+
+
+class ModelBundle:
+    def __init__(self, bundle_dir, mmap=True):
+        self.bundle_dir = bundle_dir
+        mmap_mode = 'r' if mmap else None
+
+        with open(f'{bundle_dir}/meta.json', 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        with open(f'{bundle_dir}/vocabulary.json', 'r', encoding='utf-8') as f:
+            self.terms = json.load(f)
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.classes = np.array(self.meta['classes'])
+        self.idf = np.load(f'{bundle_dir}/idf.npy', mmap_mode=mmap_mode)
+        self.compact = self.meta.get('compact')
+        if self.compact:
+            self.coef = None
+            self.sparse_coef = {
+                key: np.load(f'{bundle_dir}/coef_{key}.npy', mmap_mode=mmap_mode)
+                for key in ('indptr', 'classes', 'data', 'scale')
+                if os.path.exists(f'{bundle_dir}/coef_{key}.npy')
+            }
+        else:
+            self.coef = np.load(f'{bundle_dir}/coef.npy', mmap_mode=mmap_mode)
+        self.intercept = np.load(f'{bundle_dir}/intercept.npy', mmap_mode=mmap_mode)
+        self._patterns = None
+
+    def _load_patterns(self):
+        if self._patterns is None:
+            with open(f'{self.bundle_dir}/patterns.json', 'r', encoding='utf-8') as f:
+                self._patterns = json.load(f)
+        return self._patterns
+
+    @property
+    def patterns(self):
+        return self._load_patterns()['patterns']
+
+    @property
+    def intent_responses(self):
+        return self._load_patterns()['intent_responses']
+
+    def matches_dataset(self, dataset_path, fingerprint):
+        return (
+            self.meta.get('preprocess_fingerprint') == fingerprint
+            and self.meta.get('dataset_sha256') == file_sha256(dataset_path)
+        )
+
+    def to_sklearn(self):
+        if self.compact:
+            raise ValueError("Bundle ringkas hanya bisa dimuat dengan backend numpy")
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        vectorizer_params = dict(self.meta['vectorizer'])
+        vectorizer_params['ngram_range'] = tuple(vectorizer_params['ngram_range'])
+        vectorizer = TfidfVectorizer(**vectorizer_params)
+        vectorizer.vocabulary_ = self.vocabulary
+        vectorizer.fixed_vocabulary_ = False
+        vectorizer.idf_ = self.idf
+
+        model = LogisticRegression(**self.meta['model'])
+        model.classes_ = self.classes
+        model.coef_ = self.coef
+        model.intercept_ = self.intercept
+        model.n_features_in_ = self.coef.shape[1]
+        return vectorizer, model
+
+    def to_numpy(self):
+        from numpy_backend import NumpyLogisticModel, NumpyTfidfVectorizer, SparseCoefficients
+
+        vectorizer = NumpyTfidfVectorizer(self.vocabulary, self.idf, **self.meta['vectorizer'])
+        coef = self.coef
+        if self.compact:
+            coef = SparseCoefficients(shape=tuple(self.compact['shape']), **self.sparse_coef)
+        model = NumpyLogisticModel(self.classes, coef, self.intercept, self.meta['probability'])
+        return vectorizer, model
+
+
+def find_bundle(model_dir, name='bundle'):
+    bundle_dir = f'{model_dir}/{name}'
+    if not os.path.exists(f'{bundle_dir}/meta.json'):
+        return None
+    with open(f'{bundle_dir}/meta.json', 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != BUNDLE_VERSION:
+        return None
+    model_path = f'{model_dir}/model.pkl'
+    if meta.get('model_sha256') and os.path.exists(model_path):
+        if file_sha256(model_path) != meta['model_sha256']:
+            return None
+    return bundle_dir
+
+
+def main():
+    model_dir = 'models'
+    with open(f'{model_dir}/vectorizer.pkl', 'rb') as f:
+        vectorizer = pickle.load(f)
+    with open(f'{model_dir}/model.pkl', 'rb') as f:
+        model = pickle.load(f)
+    bundle_dir = export_bundle(vectorizer, model, 'datasets.json', model_dir)
+    print(f"Bundle model diekspor ke {bundle_dir}")
+
+
+if __name__ == "__main__":
+    main()
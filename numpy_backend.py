@@ -0,0 +1,123 @@
+import re
+
+import numpy as np
+
+_WHITE_SPACES = re.compile(r"\s\s+")
+
+
+class NumpyTfidfVectorizer:
+    def __init__(self, vocabulary, idf, analyzer='char_wb', ngram_range=(1, 1), lowercase=True,
+                 binary=False, sublinear_tf=False, use_idf=True, norm='l2', strip_accents=None, **_):
+        if analyzer != 'char_wb':
+            raise ValueError(f"Analyzer {analyzer!r} tidak didukung backend numpy")
+        if strip_accents is not None:
+            raise ValueError("strip_accents tidak didukung backend numpy")
+        if norm not in ('l2', None):
+            raise ValueError(f"Norm {norm!r} tidak didukung backend numpy")
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64) if use_idf else None
+        self.min_n, self.max_n = ngram_range
+        self.lowercase = lowercase
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+    def _count(self, text):
+        if self.lowercase:
+            text = text.lower()
+        text = _WHITE_SPACES.sub(" ", text)
+        vocabulary = self.vocabulary
+        counts = {}
+        for word in text.split():
+            word = f' {word} '
+            word_len = len(word)
+            for n in range(self.min_n, self.max_n + 1):
+                for offset in range(max(word_len - n, 0) + 1):
+                    index = vocabulary.get(word[offset:offset + n])
+                    if index is not None:
+                        counts[index] = counts.get(index, 0) + 1
+                if word_len <= n:
+                    break
+        return counts
+
+    def transform_one(self, text):
+        counts = self._count(text)
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            np.log(values, out=values)
+            values += 1.0
+        if self.idf is not None:
+            values *= self.idf[indices]
+        if self.norm == 'l2' and len(values):
+            norm = np.sqrt(np.dot(values, values))
+            if norm > 0:
+                values /= norm
+        return indices, values
+
+    def transform(self, texts):
+        return [self.transform_one(text) for text in texts]
+
+
+class SparseCoefficients:
+    """Bobot kelas x fitur dalam CSR per fitur; `scale` per kelas untuk bobot int8."""
+
+    def __init__(self, shape, indptr, classes, data, scale=None):
+        self.shape = shape
+        self.indptr = indptr
+        self.classes = classes
+        self.data = data
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float64)
+
+    def dot(self, indices, values):
+        starts = self.indptr[indices]
+        lengths = self.indptr[indices + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(self.shape[0], dtype=np.float64)
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        positions = np.arange(total) + offsets
+        weights = self.data[positions] * np.repeat(values, lengths)
+        scores = np.bincount(self.classes[positions], weights=weights, minlength=self.shape[0])
+        if self.scale is not None:
+            scores *= self.scale
+        return scores
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.indptr, self.classes, self.data) if a is not None) + (
+            self.scale.nbytes if self.scale is not None else 0)
+
+
+class NumpyLogisticModel:
+    def __init__(self, classes, coef, intercept, probability='softmax'):
+        self.classes_ = np.asarray(classes)
+        self.coef = coef
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.probability = probability
+        self.sparse = isinstance(coef, SparseCoefficients)
+
+    def decision_function(self, rows):
+        scores = np.empty((len(rows), self.coef.shape[0]), dtype=np.float64)
+        for row, (indices, values) in enumerate(rows):
+            if self.sparse:
+                scores[row] = self.coef.dot(indices, values)
+            else:
+                scores[row] = self.coef[:, indices] @ values
+        scores += self.intercept
+        return scores
+
+    def predict_proba(self, rows):
+        scores = self.decision_function(rows)
+        if self.probability == 'binary':
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        if self.probability == 'ovr':
+            proba = 1.0 / (1.0 + np.exp(-scores))
+            return proba / proba.sum(axis=1, keepdims=True)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
@@ -0,0 +1,158 @@
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class InMemorySessionStore:
+    """Riwayat intent per sesi dengan TTL geser dan batas jumlah sesi.
+
+    OrderedDict diurutkan menurut akses terakhir, jadi sesi paling lama tidak
+    aktif selalu di depan: kedaluwarsa dan eviksi LRU sama-sama O(1) per sesi.
+    Nilai disimpan sebagai tuple (kedaluwarsa, intent...) dan string intent
+    di-intern supaya dipakai bersama oleh semua sesi.
+    """
+
+    def __init__(self, ttl=1800, max_sessions=100000, history=3, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.history = history
+        self.clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def _purge(self, now):
+        sessions = self._sessions
+        while sessions:
+            session_id, value = next(iter(sessions.items()))
+            if value[0] > now:
+                break
+            del sessions[session_id]
+            self.expired += 1
+
+    def get(self, session_id):
+        now = self.clock()
+        with self._lock:
+            value = self._sessions.get(session_id)
+            if value is None:
+                return []
+            if value[0] <= now:
+                del self._sessions[session_id]
+                self.expired += 1
+                return []
+            self._sessions[session_id] = (now + self.ttl,) + value[1:]
+            self._sessions.move_to_end(session_id)
+            return list(value[1:])
+
+    def record(self, session_id, intent):
+        now = self.clock()
+        with self._lock:
+            value = self._sessions.pop(session_id, None)
+            intents = value[1:] if value is not None and value[0] > now else ()
+            intents = (intents + (sys.intern(str(intent)),))[-self.history:]
+            self._sessions[session_id] = (now + self.ttl,) + intents
+            self._purge(now)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        return {
+            "backend": "memory",
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl": self.ttl,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        pass
+
+
+class SqliteSessionStore:
+    """Backend persisten; riwayat sesi bertahan saat proses dimulai ulang."""
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, path="sessions.db", ttl=1800, history=3, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.history = history
+        self.clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, intents TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.expired = 0
+
+    def get(self, session_id):
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT intents FROM sessions WHERE id = ? AND expires > ?", (session_id, now)
+            ).fetchone()
+            if row is None:
+                return []
+            self._conn.execute("UPDATE sessions SET expires = ? WHERE id = ?", (now + self.ttl, session_id))
+        return row[0].split(",") if row[0] else []
+
+    def record(self, session_id, intent):
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT intents FROM sessions WHERE id = ? AND expires > ?", (session_id, now)
+            ).fetchone()
+            intents = row[0].split(",") if row and row[0] else []
+            intents = (intents + [intent])[-self.history:]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, intents, expires) VALUES (?, ?, ?)",
+                (session_id, ",".join(intents), now + self.ttl),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self.expired += self._conn.execute("DELETE FROM sessions WHERE expires <= ?", (now,)).rowcount
+
+    def clear(self, session_id):
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions WHERE expires > ?", (self.clock(),)).fetchone()[0]
+
+    def stats(self):
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "sessions": len(self),
+            "ttl": self.ttl,
+            "expired": self.expired,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_session_store(backend="memory", ttl=1800, max_sessions=100000, history=3, path="sessions.db"):
+    if backend == "memory":
+        return InMemorySessionStore(ttl=ttl, max_sessions=max_sessions, history=history)
+    if backend == "sqlite":
+        return SqliteSessionStore(path=path, ttl=ttl, history=history)
+    raise ValueError(f"Backend sesi tidak dikenal: {backend}")
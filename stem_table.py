@@ -0,0 +1,91 @@
+"""Tabel kata -> kata dasar yang dihitung saat training.
+
+Kata yang ada di tabel di-stem dengan satu lookup dict; hanya kata di luar
+tabel yang diteruskan ke stemmer Sastrawi, dan stemmer itu baru dibuat
+(beserta kamus bawaannya) saat kata di luar tabel pertama kali muncul.
+Sastrawi men-stem kalimat kata per kata, jadi hasilnya identik dengan
+memanggil ``stemmer.stem`` pada seluruh kalimat.
+"""
+import json
+import os
+import threading
+
+
+class StemTable:
+    def __init__(self, stemmer_factory):
+        self.stemmer_factory = stemmer_factory
+        self.table = {}
+        self.path = None
+        self._loaded = None
+        self._stemmer = None
+        self._lock = threading.Lock()
+
+    @property
+    def stemmer(self):
+        if self._stemmer is None:
+            with self._lock:
+                if self._stemmer is None:
+                    self._stemmer = self.stemmer_factory()
+        return self._stemmer
+
+    @property
+    def stemmer_loaded(self):
+        return self._stemmer is not None
+
+    def stem_word(self, word):
+        stemmed = self.table.get(word)
+        if stemmed is None:
+            stemmed = self.stemmer.stem(word)
+        return stemmed
+
+    def stem(self, text, cache=None):
+        table = self.table
+        words = []
+        for word in text.split():
+            stemmed = table.get(word)
+            if stemmed is None:
+                stemmed = cache.stem(word, self.stemmer.stem) if cache is not None else self.stemmer.stem(word)
+            words.append(stemmed)
+        return ' '.join(words)
+
+    def build(self, words):
+        for word in sorted(set(words)):
+            if word not in self.table:
+                self.table[word] = self.stemmer.stem(word)
+        return len(self.table)
+
+    def save(self, path, fingerprint):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": fingerprint, "stems": self.table}, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def load(self, path, fingerprint):
+        # Dibaca ulang bila berkasnya berubah (mis. hot reload setelah training ulang)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        version = (path, stat.st_mtime_ns, stat.st_size, fingerprint)
+        if version == self._loaded:
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if payload.get("fingerprint") != fingerprint:
+            return False
+        # Digabung, bukan diganti: beberapa engine (mis. hasil hot reload) berbagi tabel yang sama
+        self.table = {**self.table, **payload.get("stems", {})}
+        self.path = path
+        self._loaded = version
+        return True
+
+    def stats(self):
+        return {
+            "words": len(self.table),
+            "path": self.path,
+            "sastrawi_loaded": self.stemmer_loaded,
+        }
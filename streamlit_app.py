@@ -1,6 +1,22 @@
+import os
+import threading
+
 import streamlit as st
-import time
-from chatbot_engine import ChatbotEngine
+
+# Hot set: quick actions + pesan paling sering dari log, dihitung sekali per proses
+QUICK_ACTIONS = [
+    "Apa itu serum?",
+    "Rekomendasi untuk kulit berjerawat",
+    "Cara pemesanan",
+    "Metode pembayaran",
+    "Jam operasional"
+]
+HOT_SET_LOG = os.environ.get("CHATBOT_HOT_SET_LOG", "")
+HOT_SET_SIZE = int(os.environ.get("CHATBOT_HOT_SET_SIZE", "50"))
+# Jumlah kata per potongan saat respons dialirkan, sama seperti /chat/stream
+STREAM_CHUNK_WORDS = int(os.environ.get("CHATBOT_STREAM_CHUNK_WORDS", "8"))
+# Selang cek ulang selama engine masih dimuat di thread latar
+LOAD_POLL_INTERVAL = 0.5
 
 # Page configuration
 st.set_page_config(
@@ -15,6 +31,14 @@ st.markdown("""
     .stChatFloatingInputContainer {
         bottom: 20px;
     }
+    /* Jeda "mengetik" dijalankan di browser, bukan dengan sleep di thread server */
+    @keyframes muncul {
+        from { opacity: 0; transform: translateY(4px); }
+        to { opacity: 1; transform: none; }
+    }
+    .stChatMessage:has([data-testid="stChatMessageAvatarAssistant"]) {
+        animation: muncul 0.3s ease-out 0.5s both;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -22,18 +46,44 @@ st.markdown("""
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-# --- Model Loading with Caching ---
+# --- Model Loading in the background ---
+def create_chatbot_engine():
+    # chatbot_engine (numpy, sklearn, Sastrawi) is imported here so the page renders before it loads
+    from chatbot_engine import ChatbotEngine, load_hot_queries
+    engine = ChatbotEngine(model_dir='models', dataset_path='datasets.json')
+    try:
+        hot_queries = load_hot_queries(HOT_SET_LOG, HOT_SET_SIZE)
+    except OSError:
+        hot_queries = []
+    engine.warm_hot_set(QUICK_ACTIONS + hot_queries)
+    return engine
+
+class EngineLoader:
+    def __init__(self):
+        self.engine = None
+        self.error = None
+        self.thread = threading.Thread(target=self._load, name="muat-engine", daemon=True)
+        self.thread.start()
+
+    def _load(self):
+        try:
+            self.engine = create_chatbot_engine()
+        except Exception as e:
+            self.error = e
+
 @st.cache_resource
-def get_chatbot_engine():
-    # Helper to load the engine only once
-    return ChatbotEngine(model_dir='models', dataset_path='datasets.json')
-
-try:
-    with st.spinner("Sedang menyiapkan Beauty Paw Chatbot..."):
-        chatbot = get_chatbot_engine()
-except Exception as e:
-    st.error(f"Gagal memuat model: {e}")
+def get_engine_loader():
+    # Started only once; shared by every session in this process
+    return EngineLoader()
+
+loader = get_engine_loader()
+if loader.error is not None:
+    # Kegagalan tidak ikut di-cache: rerun berikutnya (sesi mana pun) memulai pemuatan baru
+    get_engine_loader.clear()
+    st.error(f"Gagal memuat model: {loader.error}")
+    st.button("Coba lagi")
     st.stop()
+chatbot = loader.engine
 
 # Sidebar
 with st.sidebar:
@@ -41,16 +91,8 @@ with st.sidebar:
     st.markdown("Asisten virtual untuk kebutuhan skincare Anda.")
     
     st.subheader("Topik Populer:")
-    quick_actions = [
-        "Apa itu serum?",
-        "Rekomendasi untuk kulit berjerawat",
-        "Cara pemesanan",
-        "Metode pembayaran",
-        "Jam operasional"
-    ]
-    
-    for action in quick_actions:
-        if st.button(action, use_container_width=True):
+    for action in QUICK_ACTIONS:
+        if st.button(action, use_container_width=True, disabled=chatbot is None):
             st.session_state.messages.append({"role": "user", "content": action})
 
 # Display Chat History
@@ -60,6 +102,19 @@ for message in st.session_state.messages:
         if "confidence" in message:
              st.caption(f"Confidence: {message['confidence']}%")
 
+if chatbot is None:
+    st.info("Sedang menyiapkan Beauty Paw Chatbot...")
+    st.chat_input("Ketik pesan Anda...", disabled=True)
+
+    # Dicek ulang oleh timer fragment, bukan sleep di thread script; halaman penuh dijalankan ulang saat siap
+    @st.fragment(run_every=LOAD_POLL_INTERVAL)
+    def tunggu_engine():
+        if loader.engine is not None or loader.error is not None:
+            st.rerun()
+
+    tunggu_engine()
+    st.stop()
+
 # Encode Chat Logic
 if prompt := st.chat_input("Ketik pesan Anda..."):
     st.session_state.messages.append({"role": "user", "content": prompt})
@@ -71,15 +126,13 @@ if st.session_state.messages and st.session_state.messages[-1]["role"] == "user"
     user_text = st.session_state.messages[-1]["content"]
     
     with st.chat_message("assistant"):
-        with st.spinner("Mengetik..."):
-            time.sleep(0.5) # Natural delay
-            
-            result = chatbot.get_response(user_text)
-            response_text = result["response"]
-            confidence = result.get("confidence", 0) * 100
-            
-            st.markdown(response_text)
-            st.caption(f"Confidence: {confidence:.1f}%")
+        # Engine ada di proses ini, jadi generator-nya langsung dialirkan tanpa lewat /chat/stream
+        stream = chatbot.stream_response(user_text, words_per_chunk=STREAM_CHUNK_WORDS)
+        result = next(stream)
+        confidence = result.get("confidence", 0) * 100
+
+        response_text = st.write_stream(stream)
+        st.caption(f"Confidence: {confidence:.1f}%")
             
     st.session_state.messages.append({
         "role": "assistant", 
@@ -0,0 +1,166 @@
+import os
+import re
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from engine_manager import model_signature
+
+POLA_ID_TENANT = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def measure_allocation(fn, *args):
+    """Jalankan fn dan kembalikan (hasil, byte yang masih teralokasi sesudahnya, ms)."""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return result, max(allocated, 0), elapsed_ms
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+class TenantNotFound(Exception):
+    pass
+
+
+class LoadedTenant:
+    __slots__ = ("engine", "memory_bytes", "load_ms", "loaded_at", "requests")
+
+    def __init__(self, engine, memory_bytes, load_ms):
+        self.engine = engine
+        self.memory_bytes = memory_bytes
+        self.load_ms = load_ms
+        self.loaded_at = time.time()
+        self.requests = 0
+
+
+class TenantRegistry:
+    """Engine per toko (root/<tenant_id>/) dalam satu proses, dimuat saat dipakai dan dikeluarkan LRU di atas anggaran memori."""
+
+    def __init__(self, root, engine_factory, memory_budget=512 * 1024 * 1024):
+        self.root = root
+        self.engine_factory = engine_factory
+        self.memory_budget = memory_budget
+        self._tenants = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._measured = {}
+        self.hits = 0
+        self.loads = 0
+        self.evicted = 0
+
+    def paths(self, tenant_id):
+        if not POLA_ID_TENANT.match(tenant_id):
+            raise TenantNotFound(tenant_id)
+        model_dir = os.path.join(self.root, tenant_id, 'models')
+        dataset_path = os.path.join(self.root, tenant_id, 'datasets.json')
+        if not os.path.isdir(model_dir) or not os.path.isfile(dataset_path):
+            raise TenantNotFound(tenant_id)
+        return model_dir, dataset_path
+
+    def available(self):
+        if not os.path.isdir(self.root):
+            return []
+        tenants = []
+        for name in sorted(os.listdir(self.root)):
+            try:
+                self.paths(name)
+            except TenantNotFound:
+                continue
+            tenants.append(name)
+        return tenants
+
+    def _lookup(self, tenant_id):
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is None:
+                return None
+            self._tenants.move_to_end(tenant_id)
+            tenant.requests += 1
+            self.hits += 1
+            return tenant.engine
+
+    def get(self, tenant_id):
+        engine = self._lookup(tenant_id)
+        if engine is not None:
+            return engine
+
+        model_dir, dataset_path = self.paths(tenant_id)
+        with self._load_lock:
+            # Permintaan lain untuk tenant yang sama mungkin sudah memuatnya selagi kita menunggu
+            engine = self._lookup(tenant_id)
+            if engine is not None:
+                return engine
+
+            # Memori diukur dengan tracemalloc (selisih RSS tidak naik lagi setelah eviksi karena memori dipakai ulang);
+            # tracing lambat, jadi hanya sekali per versi model tenant
+            key = (tenant_id, model_signature(model_dir))
+            memory_bytes = self._measured.get(key)
+            if memory_bytes is None:
+                engine, memory_bytes, load_ms = measure_allocation(self.engine_factory, model_dir, dataset_path)
+                self._measured[key] = memory_bytes
+            else:
+                start = time.perf_counter()
+                engine = self.engine_factory(model_dir, dataset_path)
+                load_ms = (time.perf_counter() - start) * 1000
+            tenant = LoadedTenant(engine, memory_bytes, load_ms)
+            tenant.requests = 1
+            with self._lock:
+                self._tenants[tenant_id] = tenant
+                self.loads += 1
+                self._evict()
+        return engine
+
+    def _evict(self):
+        # Tenant yang baru dimuat ada di akhir dan tidak pernah dikeluarkan
+        while len(self._tenants) > 1 and self.memory_used() > self.memory_budget:
+            self._tenants.popitem(last=False)
+            self.evicted += 1
+
+    def unload(self, tenant_id):
+        with self._lock:
+            return self._tenants.pop(tenant_id, None) is not None
+
+    def memory_used(self):
+        return sum(tenant.memory_bytes for tenant in self._tenants.values())
+
+    def __len__(self):
+        return len(self._tenants)
+
+    def stats(self):
+        with self._lock:
+            tenants = {
+                tenant_id: {
+                    "memory_mb": tenant.memory_bytes / 2**20,
+                    "load_ms": tenant.load_ms,
+                    "loaded_at": tenant.loaded_at,
+                    "requests": tenant.requests,
+                }
+                for tenant_id, tenant in self._tenants.items()
+            }
+            return {
+                "root": self.root,
+                "loaded": len(tenants),
+                "memory_budget_mb": self.memory_budget / 2**20,
+                "memory_used_mb": self.memory_used() / 2**20,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evicted": self.evicted,
+                "tenants": tenants,
+            }
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class PreprocessCache:
+    def __init__(self, sentence_size=10000, stem_size=50000, fingerprint=None):
+        self.fingerprint = fingerprint
+        self.sentences = LRUCache(sentence_size)
+        self.stems = LRUCache(stem_size)
+
+    def lookup(self, text):
+        if self.sentences.max_size <= 0:
+            return None
+        return self.sentences.get(text)
+
+    def store(self, text, result):
+        self.sentences.put(text, result)
+
+    def stem(self, word, stem_fn):
+        if self.stems.max_size <= 0:
+            return stem_fn(word)
+        stemmed = self.stems.get(word)
+        if stemmed is None:
+            stemmed = stem_fn(word)
+            self.stems.put(word, stemmed)
+        return stemmed
+
+    def stats(self):
+        return {
+            "sentences": self.sentences.stats(),
+            "stems": self.stems.stats(),
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        payload = {
+            "fingerprint": self.fingerprint,
+            "sentences": self.sentences.items(),
+            "stems": self.stems.items(),
+        }
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if payload.get("fingerprint") != self.fingerprint:
+            return False
+        for key, value in payload.get("sentences", []):
+            self.sentences.put(key, value)
+        for key, value in payload.get("stems", []):
+            self.stems.put(key, value)
+        return True
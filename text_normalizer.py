@@ -0,0 +1,75 @@
+import re
+
+_END = None
+
+
+class _CharTable(dict):
+    """Tabel str.translate: ganti karakter leet, buang selain [a-z0-9] dan spasi; dihitung saat pertama dipakai."""
+
+    def __init__(self, char_replacements):
+        super().__init__()
+        self.char_replacements = char_replacements
+
+    def _map_char(self, char):
+        char = self.char_replacements.get(char, char)
+        if ('a' <= char <= 'z') or ('0' <= char <= '9'):
+            return char
+        if char.isspace():
+            return ' '
+        return ''
+
+    def __missing__(self, codepoint):
+        mapped = ''.join(self._map_char(c) for c in chr(codepoint).lower())
+        self[codepoint] = mapped
+        return mapped
+
+
+class TextNormalizer:
+    def __init__(self, slang_dictionary, char_replacements):
+        self.char_table = _CharTable(char_replacements)
+        self.leet_table = str.maketrans(char_replacements)
+        self.repeated_chars = re.compile(r'(.)\1{2,}')
+        self.slang_trie = {}
+        for phrase, replacement in slang_dictionary.items():
+            node = self.slang_trie
+            for word in phrase.split():
+                node = node.setdefault(word, {})
+            node[_END] = replacement
+
+    def normalize_leet(self, text):
+        return text.translate(self.leet_table)
+
+    def normalize_repeated_chars(self, text):
+        return self.repeated_chars.sub(r'\1', text)
+
+    def normalize_slang(self, text):
+        words = text.split()
+        lower_words = [word.lower() for word in words]
+        normalized = []
+        i = 0
+        while i < len(words):
+            node = self.slang_trie
+            match_end = 0
+            replacement = None
+            j = i
+            while j < len(words):
+                node = node.get(lower_words[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match_end = j
+                    replacement = node[_END]
+            if match_end:
+                if replacement:
+                    normalized.append(replacement)
+                i = match_end
+            else:
+                normalized.append(words[i])
+                i += 1
+        return ' '.join(normalized)
+
+    def normalize(self, text):
+        text = text.translate(self.char_table)
+        text = self.repeated_chars.sub(r'\1', text)
+        return self.normalize_slang(text)
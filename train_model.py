@@ -1,14 +1,26 @@
+import argparse
+import hashlib
 import json
 import pickle
 import random
 import re
+import time
+
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-from chatbot_engine import preprocess_text, load_json_dataset
+from chat_log import iter_log_records
+from chatbot_engine import (
+    SLANG_DICTIONARY, USE_STEMMER, load_json_dataset, normalize_text, preprocess_fingerprint, preprocess_text,
+    stem_table,
+)
+from text_cache import PreprocessCache
+from model_bundle import export_bundle
 
 SINONIM_INDONESIA = {
     'apa': ['apakah', 'apa sih', 'apa ya', 'apaan', 'apa itu'],
@@ -108,104 +120,434 @@ def generate_informal_variations(text):
                 variations.append(new_text)
     return variations
 
-def augment_text(text):
-    augmented = set()
-    augmented.add(text)
+STRATEGI_AUGMENTASI = ('asli', 'sinonim', 'kata_tanya', 'typo', 'informal', 'urutan_terbalik', 'hapus_kata')
+
+def augment_by_strategy(text):
+    variants = {strategy: [] for strategy in STRATEGI_AUGMENTASI}
+    variants['asli'].append(text)
     words = text.lower().split()
     for i, word in enumerate(words):
         if word in SINONIM_INDONESIA:
             for synonym in SINONIM_INDONESIA[word][:3]:
                 new_words = words.copy()
                 new_words[i] = synonym
-                augmented.add(' '.join(new_words))
+                variants['sinonim'].append(' '.join(new_words))
     if len(words) <= 5:
         question_words = ['apa', 'apakah', 'bagaimana', 'gimana', 'berapa', 'kapan', 'dimana', 'kenapa', 'siapa']
         for qw in question_words:
             if text.lower().startswith(qw + ' '):
                 remaining = text[len(qw)+1:].strip()
-                augmented.add(remaining)
-                augmented.add(remaining + ' ' + qw)
-                augmented.add(qw + ' ' + remaining)
-    typo_vars = generate_typo_variations(text)
-    for var in typo_vars:
-        augmented.add(var)
-    informal_vars = generate_informal_variations(text)
-    for var in informal_vars:
-        augmented.add(var)
+                variants['kata_tanya'].append(remaining)
+                variants['kata_tanya'].append(remaining + ' ' + qw)
+                variants['kata_tanya'].append(qw + ' ' + remaining)
+    variants['typo'].extend(generate_typo_variations(text))
+    variants['informal'].extend(generate_informal_variations(text))
     if len(words) >= 2:
-        augmented.add(' '.join(words[::-1]))
+        variants['urutan_terbalik'].append(' '.join(words[::-1]))
     if len(words) > 2:
         for i in range(len(words)):
             shorter = words[:i] + words[i+1:]
             if len(shorter) >= 1:
-                augmented.add(' '.join(shorter))
-    return list(augmented)
+                variants['hapus_kata'].append(' '.join(shorter))
+
+    seen = set()
+    ordered = []
+    for strategy in STRATEGI_AUGMENTASI:
+        for variant in variants[strategy]:
+            if variant not in seen:
+                seen.add(variant)
+                ordered.append((strategy, variant))
+    return ordered
+
+def augment_text(text):
+    return [variant for _, variant in augment_by_strategy(text)]
+
+_worker_cache = None
+
+def _init_augment_worker():
+    global _worker_cache
+    _worker_cache = PreprocessCache(sentence_size=0, stem_size=50000)
+
+def _process_pattern(task, cache=None):
+    pattern, augment = task
+    cache = cache if cache is not None else _worker_cache
+    rows = []
+    if augment:
+        for strategy, aug_pattern in augment_by_strategy(pattern):
+            processed = preprocess_text(aug_pattern, cache)
+            if processed.strip() and len(processed) >= 2:
+                rows.append((strategy, processed))
+    else:
+        processed = preprocess_text(pattern, cache)
+        if processed.strip():
+            rows.append(('asli', processed))
+    return rows
+
+def _iter_processed(tasks, workers, cache):
+    if workers <= 1:
+        if cache is None:
+            cache = PreprocessCache(sentence_size=0, stem_size=50000)
+        for task in tasks:
+            yield _process_pattern(task, cache)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_augment_worker) as executor:
+        yield from executor.map(_process_pattern, tasks, chunksize=16)
+
+AUGMENT_VERSION = 1
+
+def augment_fingerprint():
+    payload = json.dumps(
+        [AUGMENT_VERSION, preprocess_fingerprint(), SINONIM_INDONESIA, VARIASI_INFORMAL],
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+class AugmentCache:
+    def __init__(self, path):
+        self.path = path
+        self.fingerprint = augment_fingerprint()
+        self.rows = {}
+        self.used = set()
+        self.reused = 0
+        self.recomputed = 0
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                payload = {}
+            if payload.get("fingerprint") == self.fingerprint:
+                self.rows = payload.get("rows", {})
+
+    @staticmethod
+    def key(pattern, augment):
+        return hashlib.sha256(f'{int(augment)}|{pattern}'.encode('utf-8')).hexdigest()
+
+    def get(self, pattern, augment):
+        key = self.key(pattern, augment)
+        self.used.add(key)
+        rows = self.rows.get(key)
+        if rows is None:
+            return None
+        self.reused += 1
+        return [tuple(row) for row in rows]
 
-def load_dataset(filepath, augment=True):
+    def put(self, pattern, augment, rows):
+        key = self.key(pattern, augment)
+        self.used.add(key)
+        self.rows[key] = [list(row) for row in rows]
+        self.recomputed += 1
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        rows = {key: value for key, value in self.rows.items() if key in self.used}
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": self.fingerprint, "rows": rows}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+def _iter_cached(tasks, workers, cache, row_cache):
+    cached = [row_cache.get(pattern, augment) for pattern, augment in tasks]
+    missing = [task for task, rows in zip(tasks, cached) if rows is None]
+    computed = _iter_processed(missing, workers, cache)
+    for task, rows in zip(tasks, cached):
+        if rows is None:
+            rows = next(computed)
+            row_cache.put(task[0], task[1], rows)
+        yield rows
+
+WEAK_LABEL_MIN_CONFIDENCE = 0.5
+
+def load_weak_labels(paths, intents, min_confidence=WEAK_LABEL_MIN_CONFIDENCE, tenant_id=None):
+    """Pesan dari log chat (ChatLogger) berlabel intent hasil prediksi saat itu.
+
+    Hanya prediksi tanpa fallback, dengan confidence minimal `min_confidence`, dan
+    intentnya masih ada di dataset. Pesan yang sama memakai label terbarunya.
+    """
+    labelled = {}
+    for path in paths:
+        for record in iter_log_records(path):
+            if record.get('tenant_id') != tenant_id or record.get('fallback'):
+                continue
+            if record.get('intent') not in intents or (record.get('confidence') or 0.0) < min_confidence:
+                continue
+            labelled[record['message']] = record['intent']
+    return [(tag, message) for message, tag in labelled.items()]
+
+def build_training_rows(filepath, augment=True, cache=None, workers=1, row_cache=None,
+                        chat_logs=None, min_confidence=WEAK_LABEL_MIN_CONFIDENCE):
     data = load_json_dataset(filepath)
+    sources = []
+    for intent in data['intents']:
+        for pattern in intent['patterns']:
+            sources.append((intent['tag'], pattern))
+
     patterns = []
     labels = []
+    groups = []
+    strategy_counts = {strategy: {"dihasilkan": 0, "unik": 0} for strategy in STRATEGI_AUGMENTASI}
+    seen_per_intent = {}
+
+    def add_rows(group, tag, rows, strategy_override=None):
+        seen = seen_per_intent.setdefault(tag, set())
+        for strategy, processed in rows:
+            strategy = strategy_override or strategy
+            strategy_counts[strategy]["dihasilkan"] += 1
+            if processed in seen:
+                continue
+            seen.add(processed)
+            strategy_counts[strategy]["unik"] += 1
+            patterns.append(processed)
+            labels.append(tag)
+            groups.append(group)
+
+    tasks = [(pattern, augment) for _, pattern in sources]
+    if row_cache is not None:
+        processed_rows = _iter_cached(tasks, workers, cache, row_cache)
+    else:
+        processed_rows = _iter_processed(tasks, workers, cache)
+    for group, ((tag, _), rows) in enumerate(zip(sources, processed_rows)):
+        add_rows(group, tag, rows)
+
+    if chat_logs:
+        # Data berlabel lemah tidak diaugmentasi; tiap pesan jadi grup sendiri
+        weak = load_weak_labels(chat_logs, {tag for tag, _ in sources}, min_confidence)
+        strategy_counts['log'] = {"dihasilkan": 0, "unik": 0}
+        weak_rows = _iter_processed([(message, False) for _, message in weak], workers, cache) if weak else []
+        for group, ((tag, _), rows) in enumerate(zip(weak, weak_rows), start=len(sources)):
+            add_rows(group, tag, rows, strategy_override='log')
+
+    return patterns, labels, groups, strategy_counts
+
+def collect_stem_words(filepath):
+    words = set()
+    for value in SLANG_DICTIONARY.values():
+        words.update(normalize_text(value).split())
+    data = load_json_dataset(filepath)
     for intent in data['intents']:
-        tag = intent['tag']
         for pattern in intent['patterns']:
-            if augment:
-                augmented_patterns = augment_text(pattern)
-                for aug_pattern in augmented_patterns:
-                    processed = preprocess_text(aug_pattern)
-                    if processed.strip() and len(processed) >= 2:
-                        patterns.append(processed)
-                        labels.append(tag)
-            else:
-                processed = preprocess_text(pattern)
-                if processed.strip():
-                    patterns.append(processed)
-                    labels.append(tag)
+            for variant in augment_text(pattern):
+                words.update(normalize_text(variant).split())
+    return words
+
+def export_stem_table(filepath, output_dir='models'):
+    path = f'{output_dir}/stem_table.json'
+    if not USE_STEMMER:
+        return None
+    fingerprint = preprocess_fingerprint()
+    stem_table.load(path, fingerprint)
+    known = len(stem_table.table)
+    size = stem_table.build(collect_stem_words(filepath))
+    stem_table.save(path, fingerprint)
+    print(f"Tabel stem disimpan di {path} ({size} kata, {size - known} baru)")
+    return path
+
+def load_dataset(filepath, augment=True, cache=None, workers=1, chat_logs=None,
+                 min_confidence=WEAK_LABEL_MIN_CONFIDENCE):
+    patterns, labels, _, _ = build_training_rows(filepath, augment, cache, workers,
+                                                 chat_logs=chat_logs, min_confidence=min_confidence)
     return patterns, labels
 
-def train_model(X_train, X_test, y_train, y_test):
-    vectorizer = TfidfVectorizer(
-        max_features=3000,
-        ngram_range=(1, 4),
-        min_df=1,
-        max_df=0.95,
-        sublinear_tf=True,
-        analyzer='char_wb',
-    )
+def print_strategy_counts(strategy_counts):
+    print("Variasi per strategi augmentasi (dihasilkan -> unik setelah preprocessing):")
+    for strategy, counts in strategy_counts.items():
+        print(f"  {strategy:<16} {counts['dihasilkan']:>6} -> {counts['unik']:>6}")
+
+def warm_start_coefficients(vectorizer, previous_vectorizer, previous_model, labels, min_overlap=0.9):
+    if previous_vectorizer is None or previous_model is None:
+        return None, "model sebelumnya tidak ditemukan"
+    if sorted(set(labels)) != [str(c) for c in previous_model.classes_]:
+        return None, "daftar intent berubah"
+    if vectorizer.vocabulary_ == previous_vectorizer.vocabulary_:
+        return (previous_model.coef_.copy(), previous_model.intercept_.copy()), "vocabulary sama"
+
+    shared = [
+        (index, previous_vectorizer.vocabulary_[term])
+        for term, index in vectorizer.vocabulary_.items()
+        if term in previous_vectorizer.vocabulary_
+    ]
+    if len(shared) < min_overlap * len(vectorizer.vocabulary_):
+        return None, f"vocabulary berubah terlalu banyak ({len(shared)}/{len(vectorizer.vocabulary_)} term sama)"
+    coef = np.zeros((previous_model.coef_.shape[0], len(vectorizer.vocabulary_)))
+    new_index, old_index = (np.array(ids) for ids in zip(*shared))
+    coef[:, new_index] = previous_model.coef_[:, old_index]
+    reason = f"vocabulary dipetakan ulang ({len(shared)}/{len(vectorizer.vocabulary_)} term sama)"
+    return (coef, previous_model.intercept_.copy()), reason
+
+def load_previous_model(model_dir='models'):
+    try:
+        with open(f'{model_dir}/vectorizer.pkl', 'rb') as f:
+            vectorizer = pickle.load(f)
+        with open(f'{model_dir}/model.pkl', 'rb') as f:
+            model = pickle.load(f)
+    except (OSError, pickle.UnpicklingError):
+        return None, None
+    return vectorizer, model
+
+VECTORIZER_CONFIG = {
+    'max_features': 3000,
+    'ngram_range': (1, 4),
+    'min_df': 1,
+    'max_df': 0.95,
+    'sublinear_tf': True,
+    'analyzer': 'char_wb',
+}
+
+MODEL_CONFIG = {
+    'max_iter': 2000,
+    'random_state': 42,
+    'C': 10.0,
+    'class_weight': 'balanced',
+    'solver': 'lbfgs',
+}
+
+def make_vectorizer(**overrides):
+    return TfidfVectorizer(**{**VECTORIZER_CONFIG, **overrides})
+
+def make_model(**overrides):
+    return LogisticRegression(**{**MODEL_CONFIG, **overrides})
+
+def train_model(X_train, X_test, y_train, y_test, previous=None, timings=None):
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    vectorizer = make_vectorizer()
     X_train_tfidf = vectorizer.fit_transform(X_train)
     X_test_tfidf = vectorizer.transform(X_test)
-    model = LogisticRegression(
-        max_iter=2000,
-        random_state=42,
-        C=10.0,
-        class_weight='balanced',
-        solver='lbfgs',
-    )
+    timings["vectorizer TF-IDF"] = time.perf_counter() - start
+
+    initial = None
+    if previous is not None:
+        initial, reason = warm_start_coefficients(vectorizer, previous[0], previous[1], y_train)
+        print(f"Warm start: {'dipakai' if initial is not None else 'tidak dipakai'} ({reason})")
+
+    start = time.perf_counter()
+    model = make_model(warm_start=initial is not None)
+    if initial is not None:
+        model.coef_, model.intercept_ = initial
     model.fit(X_train_tfidf, y_train)
+    timings["logistic regression"] = time.perf_counter() - start
     y_pred = model.predict(X_test_tfidf)
     accuracy = accuracy_score(y_test, y_pred)
     print(f"Akurasi Model: {accuracy:.4f}")
     return vectorizer, model
 
-def save_model(vectorizer, model, output_dir='models'):
+def strip_vectorizer(vectorizer):
+    # stop_words_ hanya untuk introspeksi dan bisa berisi ribuan term yang tidak dipakai saat inferensi
+    if hasattr(vectorizer, 'stop_words_'):
+        del vectorizer.stop_words_
+    return vectorizer
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+def train_sparse_model(X_train, y_train, vectorizer, l1_ratio):
+    print(f"Melatih model elastic-net (l1_ratio={l1_ratio}, solver saga), ini bisa memakan beberapa menit...")
+    model = make_model(solver='saga', l1_ratio=l1_ratio, max_iter=300, tol=1e-3)
+    model.fit(vectorizer.transform(X_train), y_train)
+    return model
+
+def save_compact_model(vectorizer, model, X_test, y_test, output_dir='models', dataset_path='datasets.json',
+                       dtype='int8', prune=0.9):
+    from model_bundle import ModelBundle
+
+    compact_dir = export_bundle(vectorizer, model, dataset_path, output_dir, name='compact',
+                                compact={"dtype": dtype, "prune": prune})
+    compact_vectorizer, compact_model = ModelBundle(compact_dir, mmap=False).to_numpy()
+    compact_pred = compact_model.predict_proba(compact_vectorizer.transform(X_test)).argmax(axis=1)
+    compact_accuracy = accuracy_score(y_test, compact_model.classes_[compact_pred])
+    full_accuracy = accuracy_score(y_test, model.predict(vectorizer.transform(X_test)))
+
+    nnz = compact_model.coef.data.size
+    total = compact_model.coef.shape[0] * compact_model.coef.shape[1]
+    print(f"Model ringkas disimpan di {compact_dir} ({dtype}, {nnz}/{total} bobot non-nol)")
+    print(f"  ukuran bundle penuh : {directory_size(f'{output_dir}/bundle') / 1024:8.1f} KB")
+    print(f"  ukuran bundle ringkas: {directory_size(compact_dir) / 1024:8.1f} KB")
+    print(f"  akurasi penuh {full_accuracy:.4f} -> ringkas {compact_accuracy:.4f} "
+          f"(selisih {compact_accuracy - full_accuracy:+.4f})")
+    return compact_dir
+
+def save_model(vectorizer, model, output_dir='models', dataset_path='datasets.json'):
     os.makedirs(output_dir, exist_ok=True)
+    strip_vectorizer(vectorizer)
     with open(f'{output_dir}/vectorizer.pkl', 'wb') as f:
         pickle.dump(vectorizer, f)
     with open(f'{output_dir}/model.pkl', 'wb') as f:
         pickle.dump(model, f)
-    print(f"Model disimpan di folder {output_dir}")
+    bundle_dir = export_bundle(vectorizer, model, dataset_path, output_dir)
+    print(f"Model disimpan di folder {output_dir} (bundle: {bundle_dir})")
 
 def main():
+    parser = argparse.ArgumentParser(description="Latih model Beauty Paw Chatbot")
+    parser.add_argument('--dataset', default='datasets.json')
+    parser.add_argument('--output-dir', default='models')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--incremental', action='store_true',
+                        help="pakai ulang hasil augmentasi yang tidak berubah dan warm start dari model lama, "
+                             "lalu cetak apa yang dipakai ulang/dihitung ulang beserta waktunya")
+    parser.add_argument('--compact', action='store_true',
+                        help="ekspor juga varian ringkas (bobot jarang + terkuantisasi) ke models/compact")
+    parser.add_argument('--compact-dtype', choices=('float32', 'int8'), default='int8')
+    parser.add_argument('--compact-prune', type=float, default=0.9,
+                        help="fraksi bobot terkecil per kelas yang dinolkan")
+    parser.add_argument('--compact-l1-ratio', type=float, default=None,
+                        help="latih ulang dengan elastic-net (saga) alih-alih memangkas model penuh; jauh lebih lambat")
+    parser.add_argument('--chat-log', nargs='+', default=None,
+                        help="direktori/berkas log chat (CHATBOT_CHAT_LOG_DIR) sebagai data latih berlabel lemah")
+    parser.add_argument('--chat-log-min-confidence', type=float, default=WEAK_LABEL_MIN_CONFIDENCE)
+    args = parser.parse_args()
+
     print("Beauty Paw Chatbot - Melatih Model")
-    dataset_path = 'datasets.json'
-    patterns, labels = load_dataset(dataset_path, augment=True)
+    dataset_path = args.dataset
+    timings = {}
+
+    row_cache = AugmentCache(f'{args.output_dir}/augment_cache.json') if args.incremental else None
+    previous = load_previous_model(args.output_dir) if args.incremental else None
+
+    # Dibangun sebelum augmentasi supaya preprocessing data latih juga cukup lookup tabel
+    start = time.perf_counter()
+    os.makedirs(args.output_dir, exist_ok=True)
+    export_stem_table(dataset_path, args.output_dir)
+    timings["tabel stem"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    patterns, labels, _, strategy_counts = build_training_rows(
+        dataset_path, augment=True, workers=args.workers, row_cache=row_cache,
+        chat_logs=args.chat_log, min_confidence=args.chat_log_min_confidence
+    )
+    timings["augmentasi + preprocessing"] = time.perf_counter() - start
+    print_strategy_counts(strategy_counts)
+    print(f"Total data latih: {len(patterns)}")
+    if row_cache is not None:
+        print(f"Pola dipakai ulang dari cache: {row_cache.reused}, dihitung ulang: {row_cache.recomputed}")
+        row_cache.save()
+
     X_train, X_test, y_train, y_test = train_test_split(
         patterns, labels,
         test_size=0.2,
         random_state=42,
         stratify=labels
     )
-    vectorizer, model = train_model(X_train, X_test, y_train, y_test)
-    save_model(vectorizer, model)
+    vectorizer, model = train_model(X_train, X_test, y_train, y_test, previous=previous, timings=timings)
+
+    start = time.perf_counter()
+    save_model(vectorizer, model, output_dir=args.output_dir, dataset_path=dataset_path)
+    timings["simpan model + bundle"] = time.perf_counter() - start
+
+    if args.compact:
+        start = time.perf_counter()
+        compact_model = model
+        prune = args.compact_prune
+        if args.compact_l1_ratio is not None:
+            compact_model = train_sparse_model(X_train, y_train, vectorizer, args.compact_l1_ratio)
+            prune = 0.0
+        save_compact_model(vectorizer, compact_model, X_test, y_test, output_dir=args.output_dir,
+                           dataset_path=dataset_path, dtype=args.compact_dtype, prune=prune)
+        timings["model ringkas"] = time.perf_counter() - start
+
+    if args.incremental:
+        print("Waktu per tahap:")
+        for step, seconds in timings.items():
+            print(f"  {step:<28} {seconds:7.2f} s")
     print("Pelatihan selesai")
 
 if __name__ == "__main__":